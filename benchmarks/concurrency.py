@@ -0,0 +1,125 @@
+"""Watch the adaptive concurrency controller converge against a local server
+
+Starts a stand-in site whose latency grows once more requests are in flight
+than its current capacity, and which answers 503 beyond twice that. The
+capacity and base latency change between phases; each cycle prints the limit
+the controller ended on next to what the site could actually take, and each
+phase closes with the mean and spread of the host limit once it has settled.
+
+Latency is timed around the page request only, so the limit follows the
+site rather than the cost of parsing. AIMD never sits still: the host limit
+saws between about half and a little over the capacity, and the summary
+shows that band moving with each phase. The global limit only grows while
+it is the bottleneck, which a single host never makes it.
+
+    python benchmarks/concurrency.py
+"""
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import AsyncMock
+
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.bot.concurrency import ConcurrencyController
+from src.bot.manager import BotManager
+from src.scrapers.selector import SelectorConfig, SelectorScraper
+from src.storage.handler import StorageHandler
+
+# (cycles, base latency in seconds, capacity in concurrent requests)
+PHASES = [
+    (12, 0.02, 12),
+    (12, 0.08, 4),
+    (12, 0.02, 20),
+]
+SOURCES = 120
+SETTLE = 3  # cycles left out of the per-phase summary
+PAGE = "<ul><li data-num='1'>1</li></ul>"
+CONFIG = SelectorConfig(item_selector="li[data-num]", number_attribute="data-num")
+
+class StandInSite:
+    def __init__(self):
+        self.in_flight = 0
+        self.base_latency = 0.02
+        self.capacity = 8
+        self.latencies = []
+        self.rejected = 0
+
+    async def handle(self, request):
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            if self.in_flight > 2 * self.capacity:
+                self.rejected += 1
+                return web.Response(status=503)
+            excess = max(0, self.in_flight - self.capacity)
+            await asyncio.sleep(self.base_latency * (1 + excess))
+            return web.Response(text=PAGE, content_type="text/html")
+        finally:
+            self.in_flight -= 1
+            self.latencies.append(time.perf_counter() - start)
+
+async def main():
+    logging.disable(logging.CRITICAL)
+    site = StandInSite()
+    app = web.Application()
+    app.router.add_get("/page/{n}", site.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    tcp = web.TCPSite(runner, "127.0.0.1", 0)
+    await tcp.start()
+    port = runner.addresses[0][1]
+
+    # A short baseline window so the phases fit in a quick run
+    controller = ConcurrencyController(
+        host_initial=2, host_maximum=64, global_maximum=64, baseline_window=5
+    )
+    scrapers = [
+        SelectorScraper(f"page-{n}", f"http://127.0.0.1:{port}/page/{n}", CONFIG)
+        for n in range(SOURCES)
+    ]
+    with TemporaryDirectory() as storage_dir:
+        bot = BotManager(scrapers, StorageHandler(storage_dir), AsyncMock(), controller=controller)
+
+        print(f"{'cycle':>5} {'capacity':>8} {'host':>6} {'global':>6} "
+              f"{'p50 ms':>7} {'503s':>5} {'cycle s':>8}")
+        cycle = 0
+        summaries = []
+        for cycles, base_latency, capacity in PHASES:
+            site.base_latency, site.capacity = base_latency, capacity
+            limits, rejected = [], 0
+            for _ in range(cycles):
+                site.latencies.clear()
+                site.rejected = 0
+                start = time.perf_counter()
+                await bot.check_all_scrapers()
+                elapsed = time.perf_counter() - start
+                snapshot = controller.snapshot()
+                host = snapshot["hosts"][f"127.0.0.1:{port}"]
+                print(
+                    f"{cycle:>5} {capacity:>8} {host['limit']:>6.1f} "
+                    f"{snapshot['global']['limit']:>6.1f} "
+                    f"{statistics.median(site.latencies) * 1000:>7.1f} "
+                    f"{site.rejected:>5} {elapsed:>8.2f}"
+                )
+                cycle += 1
+                limits.append(host["limit"])
+                rejected += site.rejected
+            settled = limits[SETTLE:]
+            summaries.append((capacity, statistics.mean(settled), statistics.pstdev(settled),
+                              min(settled), max(settled), rejected))
+
+        print(f"\n{'capacity':>8} {'mean':>6} {'stdev':>6} {'min':>6} {'max':>6} {'503s':>5}")
+        for capacity, mean, spread, low, high, rejected in summaries:
+            print(f"{capacity:>8} {mean:>6.1f} {spread:>6.1f} {low:>6.1f} {high:>6.1f} {rejected:>5}")
+
+    await runner.cleanup()
+
+if __name__ == "__main__":
+    asyncio.run(main())
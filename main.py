@@ -4,23 +4,35 @@ from src.config.config import Config
 from src.scrapers.manga import MangaScraper
 from src.scrapers.blog import BlogScraper
 from src.storage.handler import StorageHandler
+from src.storage.dedup import DedupIndex
+from src.storage.index import StateIndex
 from src.notifications.handler import NotificationHandler
 from src.bot.manager import BotManager
+from src.bot.concurrency import ConcurrencyController
+from src.logs.handler import setup_logging
+from src.websub.subscriber import WebSubSubscriber
+from src.api.server import QueryServer
 
-def setup_logging(config):
-    """Configure logging based on config"""
-    logging.basicConfig(
-        level=getattr(logging, config.scraper.log_level),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        filename=config.scraper.log_file
-    )
+async def serve(bot, services):
+    """Run the bot loop with its optional HTTP services"""
+    for service in services:
+        await service.start()
+    try:
+        await bot.run()
+    finally:
+        for service in reversed(services):
+            await service.stop()
 
 def main():
     # Load configuration
     config = Config.load()
     
-    # Setup logging
-    setup_logging(config)
+    # Setup logging, file writes happen on a background thread
+    log_listener = setup_logging(
+        log_file=config.scraper.log_file,
+        log_level=config.scraper.log_level,
+        repeat_interval=config.scraper.log_repeat_interval
+    )
     
     # Initialize components
     notifier = NotificationHandler(telegram_config=config.telegram)
@@ -30,7 +42,8 @@ def main():
     scrapers = [
         MangaScraper(
             manga_name="one-piece",
-            base_url="https://www.lelmanga.com"
+            base_url="https://www.lelmanga.com",
+            dedup_group="one-piece"  # give mirrors of the series the same group
         ),
         BlogScraper(
             feed_url="https://leo.prie.to/tag/essay/feed",
@@ -38,21 +51,64 @@ def main():
         )
     ]
     
+    # Receive pushed feed updates when a public callback URL is configured
+    services = []
+    websub = None
+    if config.websub.enabled:
+        websub = WebSubSubscriber(
+            callback_url=config.websub.callback_url,
+            host=config.websub.host,
+            port=config.websub.port,
+            lease_seconds=config.websub.lease_seconds
+        )
+        services.append(websub)
+    
+    # Suppress the same post arriving through several sources
+    dedup = None
+    if config.scraper.dedup_window > 0:
+        dedup = DedupIndex(
+            window=config.scraper.dedup_window,
+            max_entries=config.scraper.dedup_max_entries
+        )
+    
+    # Adapt the number of in-flight checks to how hosts are responding
+    controller = ConcurrencyController(
+        global_maximum=config.scraper.max_concurrency,
+        host_maximum=config.scraper.max_host_concurrency
+    )
+    
+    # Serve what the bot has seen to other local tools
+    state_index = None
+    if config.api.enabled:
+        state_index = StateIndex(history_size=config.api.history_size)
+        state_index.load(storage, [scraper.storage_key for scraper in scrapers])
+        services.append(QueryServer(
+            state_index, host=config.api.host, port=config.api.port, controller=controller
+        ))
+    
     # Initialize bot manager
     bot = BotManager(
         scrapers=scrapers,
         storage=storage,
         notifier=notifier,
-        check_interval=300  # Check every 5 minutes
+        check_interval=300,  # Check every 5 minutes
+        websub=websub,
+        push_poll_interval=config.websub.poll_interval,
+        dedup=dedup,
+        state_index=state_index,
+        controller=controller,
+        fetch_timeout=config.scraper.fetch_timeout
     )
     
     # Run the bot
     try:
-        asyncio.run(bot.run())
+        asyncio.run(serve(bot, services))
     except KeyboardInterrupt:
         logging.info("Bot stopped by user")
     except Exception as e:
-        logging.error(f"Bot stopped due to error: {e}")
+        logging.error("Bot stopped due to error: %s", e)
+    finally:
+        log_listener.stop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
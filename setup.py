@@ -7,6 +7,7 @@ setup(
     install_requires=[
         "aiohttp>=3.8.0",
         "beautifulsoup4>=4.9.3",
+        "soupsieve>=2.0",
         "feedparser>=6.0.0",
         "python-dotenv>=0.19.0",
         "requests>=2.26.0",
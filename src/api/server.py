@@ -0,0 +1,128 @@
+import hashlib
+import json
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple
+from aiohttp import web
+
+from ..bot.concurrency import ConcurrencyController
+from ..storage.index import SourceState, StateIndex
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Whether an ``If-None-Match`` header matches the current ETag"""
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == "*" or tag == etag:
+            return True
+    return False
+
+class QueryServer:
+    """Read-only HTTP API over a ``StateIndex``
+
+    Every response carries an ``ETag`` derived from the index versions and
+    boot id, and rendered bodies are cached until the underlying state
+    changes, so repeated polls by other tools cost a dict lookup.
+    """
+
+    def __init__(
+        self,
+        index: StateIndex,
+        host: str = "127.0.0.1",
+        port: int = 8081,
+        controller: Optional[ConcurrencyController] = None
+    ):
+        self.index = index
+        self.controller = controller
+        self.host = host
+        self.port = port
+        self._cache: Dict[Tuple[str, str], Tuple[str, str, bytes]] = {}
+        self._runner = None
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/health", self.handle_health)
+        app.router.add_get("/sources", self.handle_sources)
+        app.router.add_get("/concurrency", self.handle_concurrency)
+        app.router.add_get("/sources/{key}", self.handle_source)
+        app.router.add_get("/sources/{key}/{part:latest|history|health}", self.handle_source)
+        return app
+
+    async def start(self):
+        """Start serving the API"""
+        self._runner = web.AppRunner(self.build_app())
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logging.info("Query API listening on %s:%s", self.host, self.port)
+
+    async def stop(self):
+        """Stop serving the API"""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _respond(
+        self,
+        request: web.Request,
+        cache_key: Tuple[str, str],
+        version: str,
+        render: Callable[[], Any]
+    ) -> web.Response:
+        cached = self._cache.get(cache_key)
+        if cached is None or cached[0] != version:
+            # Source keys may contain characters not allowed in an ETag
+            key_digest = hashlib.blake2b(cache_key[1].encode(), digest_size=6).hexdigest()
+            etag = f'"{cache_key[0]}-{key_digest}-{self.index.boot_id}-{version}"'
+            cached = (version, etag, json.dumps(render(), default=str).encode())
+            self._cache[cache_key] = cached
+
+        _, etag, body = cached
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request.headers.get("If-None-Match", ""), etag):
+            return web.Response(status=304, headers=headers)
+        return web.Response(body=body, content_type="application/json", headers=headers)
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        def render():
+            sources = {key: self.index.sources[key].health() for key in self.index.keys()}
+            failing = [key for key, health in sources.items() if health["status"] != "ok"]
+            return {"status": "degraded" if failing else "ok", "failing": failing, "sources": sources}
+        return self._respond(request, ("health", ""), str(self.index.version), render)
+
+    async def handle_sources(self, request: web.Request) -> web.Response:
+        def render():
+            return {
+                "sources": [
+                    {"key": key, "latest": self.index.sources[key].latest}
+                    for key in self.index.keys()
+                ]
+            }
+        return self._respond(request, ("sources", ""), str(self.index.version), render)
+
+    async def handle_concurrency(self, request: web.Request) -> web.Response:
+        # Changes on every completed check, so neither cached nor tagged
+        if self.controller is None:
+            raise web.HTTPNotFound(text=json.dumps({"error": "no concurrency controller"}),
+                                   content_type="application/json")
+        return web.json_response(self.controller.snapshot())
+
+    async def handle_source(self, request: web.Request) -> web.Response:
+        key = request.match_info["key"]
+        part = request.match_info.get("part", "all")
+        state = self.index.get(key)
+        if state is None:
+            raise web.HTTPNotFound(text=json.dumps({"error": f"unknown source {key}"}),
+                                   content_type="application/json")
+
+        renderers: Dict[str, Tuple[str, Callable[[SourceState], Any]]] = {
+            "latest": (str(state.item_version), lambda s: s.latest),
+            "history": (str(state.item_version), lambda s: list(s.history)),
+            "health": (str(state.health_version), lambda s: s.health()),
+            "all": (
+                f"{state.item_version}.{state.health_version}",
+                lambda s: {"key": s.key, "latest": s.latest,
+                           "history": list(s.history), "health": s.health()}
+            ),
+        }
+        version, render = renderers[part]
+        return self._respond(request, (part, key), version, lambda: render(state))
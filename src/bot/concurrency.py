@@ -0,0 +1,206 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+@dataclass
+class Outcome:
+    """What a check reported back to its concurrency slot
+
+    ``latency`` is the round trip of the page request alone; checks that
+    only probed or never reached the network leave it unset.
+    """
+    status: Optional[int] = None
+    latency: Optional[float] = None
+    timed_out: bool = False
+
+    @property
+    def overloaded(self) -> bool:
+        return self.timed_out or self.status == 429 or (self.status or 0) >= 500
+
+class AIMDLimiter:
+    """Concurrency limit with additive increase and multiplicative decrease
+
+    Each healthy completion while checks are queued adds ``increase / limit``
+    (about ``increase`` per round of checks). An overload signal - a timeout,
+    429 or 5xx, or ``slow_streak`` consecutive latencies above
+    ``latency_tolerance`` times the baseline - multiplies the limit by
+    ``decrease``, at most once per observed round-trip so one burst of
+    failures counts as one signal.
+
+    The baseline is the lowest latency seen in the last ``baseline_window``
+    seconds: queueing never lowers it, and a lasting change in how fast the
+    host answers is accepted once the window has passed.
+    """
+
+    def __init__(
+        self,
+        initial: float = 4,
+        minimum: float = 1,
+        maximum: float = 64,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_tolerance: Optional[float] = 2.0,  # None ignores latency
+        baseline_window: float = 300.0,
+        slow_streak: int = 3,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.baseline_window = baseline_window
+        self.slow_streak = slow_streak
+        self.clock = clock
+        self.in_flight = 0
+        self.waiting = 0
+        self.latency: Optional[float] = None   # fast moving average
+        self.baseline: Optional[float] = None  # windowed minimum
+        self._baseline_at = float("-inf")
+        self._slow = 0  # consecutive slow completions
+        self.completed = 0
+        self.overloads = 0
+        self._last_decrease = float("-inf")
+        self._condition: Optional[asyncio.Condition] = None
+
+    @property
+    def condition(self) -> asyncio.Condition:
+        # Created lazily so the limiter can be built outside a running loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire(self):
+        async with self.condition:
+            self.waiting += 1
+            try:
+                await self.condition.wait_for(lambda: self.in_flight < int(self.limit))
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+
+    async def release(self):
+        async with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def record(self, latency: Optional[float], overloaded: bool):
+        """Adjust the limit from one completed request (call before release)
+
+        ``latency`` may be None for completions whose timing says nothing
+        about the host, such as probe-only checks; they still count for
+        overload and growth.
+        """
+        now = self.clock()
+        self.completed += 1
+        if latency is not None:
+            self.latency = latency if self.latency is None else 0.7 * self.latency + 0.3 * latency
+            if not overloaded and (
+                    self.baseline is None or latency <= self.baseline or
+                    now - self._baseline_at > self.baseline_window):
+                self.baseline = latency
+                self._baseline_at = now
+
+            # Queueing slows every request that follows, a lone outlier is noise
+            if (self.latency_tolerance is not None and self.baseline is not None and
+                    latency > self.latency_tolerance * self.baseline):
+                self._slow += 1
+            else:
+                self._slow = 0
+
+        if overloaded or self._slow >= self.slow_streak:
+            if now - self._last_decrease >= (self.latency or 0):
+                self._last_decrease = now
+                self._slow = 0  # requests already in flight shouldn't count twice
+                self.overloads += 1
+                self.limit = max(self.minimum, self.limit * self.decrease)
+        elif self.waiting or self.in_flight >= int(self.limit):
+            # Only grow when the current limit is actually the bottleneck
+            self.limit = min(self.maximum, self.limit + self.increase / self.limit)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "latency": round(self.latency, 4) if self.latency is not None else None,
+            "baseline": round(self.baseline, 4) if self.baseline is not None else None,
+            "completed": self.completed,
+            "overloads": self.overloads,
+        }
+
+class ConcurrencyController:
+    """Global and per-host AIMD limits for in-flight checks
+
+    Hosts react to their own 429/5xx responses, timeouts and latency. The
+    global limit reacts to timeouts only: latencies of different hosts can't
+    share a baseline, and a single failing site shouldn't throttle the rest.
+    """
+
+    def __init__(
+        self,
+        global_initial: float = 8,
+        global_maximum: float = 32,
+        host_initial: float = 2,
+        host_maximum: float = 4,
+        baseline_window: float = 300.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.host_initial = host_initial
+        self.host_maximum = host_maximum
+        self.baseline_window = baseline_window
+        self.clock = clock
+        self.global_limit = AIMDLimiter(
+            initial=global_initial, maximum=global_maximum, latency_tolerance=None, clock=clock
+        )
+        self.hosts: Dict[str, AIMDLimiter] = {}
+
+    def host(self, name: str) -> AIMDLimiter:
+        limiter = self.hosts.get(name)
+        if limiter is None:
+            limiter = AIMDLimiter(
+                initial=self.host_initial,
+                maximum=self.host_maximum,
+                baseline_window=self.baseline_window,
+                clock=self.clock
+            )
+            self.hosts[name] = limiter
+        return limiter
+
+    @asynccontextmanager
+    async def slot(self, host: str) -> AsyncIterator[Outcome]:
+        """Hold a host and a global slot for the duration of one check
+
+        The caller fills in ``status`` and ``latency`` on the yielded
+        outcome; timeouts raised inside the block are recorded automatically.
+        Only the global limit, which ignores latency, sees the time the whole
+        check took.
+        """
+        host_limit = self.host(host)
+        # Always host first, then global, so waiters can't deadlock
+        await host_limit.acquire()
+        try:
+            await self.global_limit.acquire()
+            outcome = Outcome()
+            start = self.clock()
+            try:
+                yield outcome
+            except asyncio.TimeoutError:
+                outcome.timed_out = True
+                raise
+            finally:
+                host_limit.record(outcome.latency, outcome.overloaded)
+                self.global_limit.record(self.clock() - start, outcome.timed_out)
+                await self.global_limit.release()
+        finally:
+            await host_limit.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current controller state for inspection"""
+        return {
+            "global": self.global_limit.snapshot(),
+            "hosts": {name: limiter.snapshot() for name, limiter in sorted(self.hosts.items())},
+        }
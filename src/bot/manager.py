@@ -1,11 +1,18 @@
 import asyncio
 import logging
-from typing import List, Optional
+import time
+from typing import Dict, List, Optional
 from datetime import datetime
+from urllib.parse import urlparse
 
 from ..scrapers.base import BaseScraper, ScrapedItem
 from ..storage.handler import StorageHandler
+from ..storage.dedup import DedupIndex
+from ..storage.index import StateIndex
 from ..notifications.handler import NotificationHandler, TelegramConfig
+from ..logs.handler import log_stage
+from ..websub.subscriber import WebSubSubscriber
+from .concurrency import ConcurrencyController
 
 class BotManager:
     """Manages multiple scrapers and handles updates"""
@@ -15,52 +22,139 @@ class BotManager:
         scrapers: List[BaseScraper],
         storage: StorageHandler,
         notifier: NotificationHandler,
-        check_interval: int = 300  # 5 minutes
+        check_interval: int = 300,  # 5 minutes
+        websub: Optional[WebSubSubscriber] = None,
+        push_poll_interval: int = 3600,  # safety-net polling for pushed sources
+        dedup: Optional[DedupIndex] = None,
+        state_index: Optional[StateIndex] = None,
+        controller: Optional[ConcurrencyController] = None,
+        fetch_timeout: float = 60.0
     ):
         self.scrapers = scrapers
         self.storage = storage
         self.notifier = notifier
         self.check_interval = check_interval
+        self.websub = websub
+        self.push_poll_interval = push_poll_interval
+        self.dedup = dedup
+        self.state_index = state_index
+        # Adaptive per-host and global limits on in-flight checks
+        self.controller = controller or ConcurrencyController()
+        self.fetch_timeout = fetch_timeout
+        self._last_polled: Dict[str, float] = {}
+        if websub:
+            websub.on_item = self.handle_push
         
     async def check_scraper(self, scraper: BaseScraper) -> Optional[ScrapedItem]:
         """Check a single scraper for updates"""
         try:
             # Get latest item from scraper
-            latest_item = await scraper.fetch_latest()
-            if not latest_item or not scraper.validate_item(latest_item):
-                return None
-                
-            # Get previously stored item
-            stored_data = self.storage.get_latest(scraper.storage_key)
-            stored_id = stored_data.get("id") if stored_data else None
-            
-            # If we have a new item
-            if not stored_id or latest_item.id != stored_id:
-                # Store the new item
-                self.storage.store_latest(
-                    scraper.storage_key,
-                    {
-                        "id": latest_item.id,
-                        "title": latest_item.title,
-                        "url": latest_item.url,
-                        "timestamp": latest_item.timestamp.isoformat(),
-                        "content": latest_item.content
-                    }
+            async with self.controller.slot(urlparse(scraper.url).netloc) as outcome:
+                with log_stage(scraper.storage_key, "fetch"):
+                    latest_item = await asyncio.wait_for(scraper.fetch_latest(), self.fetch_timeout)
+                outcome.status = scraper.last_status
+                outcome.latency = scraper.last_latency
+            if self.state_index is not None:
+                self.state_index.record_check(
+                    scraper.storage_key, ok=latest_item is not None,
+                    error=None if latest_item else "no item returned"
                 )
-                return latest_item
-                
+            return self.process_item(scraper, latest_item)
+
         except Exception as e:
-            logging.error(f"Error checking scraper {scraper.__class__.__name__}: {e}")
+            # asyncio.TimeoutError has an empty message
+            error = f"timed out after {self.fetch_timeout}s" if isinstance(e, asyncio.TimeoutError) else str(e)
+            logging.error(
+                "Error checking scraper %s: %s", scraper.__class__.__name__, error,
+                extra={"source": scraper.storage_key, "stage": "check"}
+            )
+            if self.state_index is not None:
+                self.state_index.record_check(scraper.storage_key, ok=False, error=error)
             
         return None
+
+    def process_item(self, scraper: BaseScraper, latest_item: Optional[ScrapedItem]) -> Optional[ScrapedItem]:
+        """Store an item if it is new, returning it when it is"""
+        if not latest_item or not scraper.validate_item(latest_item):
+            return None
+            
+        # Get previously stored item
+        stored_data = self.storage.get_latest(scraper.storage_key)
+        stored_id = stored_data.get("id") if stored_data else None
         
+        # If we have a new item
+        if not stored_id or latest_item.id != stored_id:
+            # Store the new item
+            data = {
+                "id": latest_item.id,
+                "title": latest_item.title,
+                "url": latest_item.url,
+                "timestamp": latest_item.timestamp.isoformat(),
+                "content": latest_item.content
+            }
+            self.storage.store_latest(scraper.storage_key, data)
+            if self.state_index is not None:
+                self.state_index.record_item(scraper.storage_key, data)
+            return latest_item
+            
+        return None
+
+    async def notify(self, scraper: BaseScraper, item: ScrapedItem):
+        """Send the notification for a new item"""
+        # The same post may reach us through several feeds or mirrors
+        if self.dedup is not None and self.dedup.check_and_add(item, scraper.dedup_group):
+            logging.info(
+                "Skipping duplicate notification for %s", item.url,
+                extra={"source": scraper.storage_key, "stage": "dedup"}
+            )
+            return
+
+        message = scraper.format_notification(item)
+        with log_stage(scraper.storage_key, "notify"):
+            await self.notifier.send_telegram(message)
+
+    async def handle_push(self, scraper: BaseScraper, item: ScrapedItem):
+        """Handle an item pushed by a WebSub hub"""
+        try:
+            if new_item := self.process_item(scraper, item):
+                await self.notify(scraper, new_item)
+        except Exception as e:
+            logging.error(
+                "Error handling pushed item for %s: %s", scraper.__class__.__name__, e,
+                extra={"source": scraper.storage_key, "stage": "push"}
+            )
+
+    def is_due(self, scraper: BaseScraper) -> bool:
+        """Whether a scraper should be polled this cycle
+
+        Sources with a live WebSub subscription are only polled every
+        ``push_poll_interval`` seconds as a safety net.
+        """
+        if not self.websub or not self.websub.is_subscribed(scraper):
+            return True
+        last_polled = self._last_polled.get(scraper.storage_key)
+        return last_polled is None or time.monotonic() - last_polled >= self.push_poll_interval
+        
+    async def check_and_notify(self, scraper: BaseScraper):
+        """Check one scraper and notify if it has a new item"""
+        self._last_polled[scraper.storage_key] = time.monotonic()
+        if new_item := await self.check_scraper(scraper):
+            # Send notification
+            await self.notify(scraper, new_item)
+
     async def check_all_scrapers(self):
-        """Check all scrapers for updates"""
-        for scraper in self.scrapers:
-            if new_item := await self.check_scraper(scraper):
-                # Send notification
-                message = scraper.format_notification(new_item)
-                await self.notifier.send_telegram(message)
+        """Check all scrapers for updates
+
+        Checks run concurrently; the controller decides how many are in
+        flight at once, per host and overall.
+        """
+        await asyncio.gather(*(
+            self.check_and_notify(scraper)
+            for scraper in self.scrapers if self.is_due(scraper)
+        ))
+
+        if self.websub:
+            await self.websub.maintain(self.scrapers)
                 
     async def run(self):
         """Run the bot manager in a loop"""
@@ -68,6 +162,6 @@ class BotManager:
             try:
                 await self.check_all_scrapers()
             except Exception as e:
-                logging.error(f"Error in main loop: {e}")
+                logging.error("Error in main loop: %s", e)
                 
             await asyncio.sleep(self.check_interval)
\ No newline at end of file
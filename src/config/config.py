@@ -14,6 +14,34 @@ class ScraperConfig:
     storage_dir: str = "storage"
     log_file: str = "bot.log"
     log_level: str = "INFO"
+    log_repeat_interval: float = 60.0  # seconds between identical error lines
+    dedup_window: int = 604800  # 1 week, 0 disables cross-source deduplication
+    dedup_max_entries: int = 100000
+    max_concurrency: int = 32  # ceiling for the adaptive global limit
+    max_host_concurrency: int = 4  # ceiling for the adaptive per-host limit
+    fetch_timeout: float = 60.0
+
+@dataclass
+class WebSubConfig:
+    callback_url: Optional[str] = None  # public URL of the callback endpoint, unset disables WebSub
+    host: str = "0.0.0.0"
+    port: int = 8080
+    lease_seconds: int = 86400  # 1 day
+    poll_interval: int = 3600  # safety-net polling for subscribed sources
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.callback_url)
+
+@dataclass
+class ApiConfig:
+    port: Optional[int] = None  # unset disables the query API
+    host: str = "127.0.0.1"
+    history_size: int = 50
+
+    @property
+    def enabled(self) -> bool:
+        return self.port is not None
 
 class Config:
     """Central configuration management"""
@@ -42,7 +70,30 @@ class Config:
             check_interval=int(os.getenv('CHECK_INTERVAL', '300')),
             storage_dir=os.getenv('STORAGE_DIR', 'storage'),
             log_file=os.getenv('LOG_FILE', 'bot.log'),
-            log_level=os.getenv('LOG_LEVEL', 'INFO')
+            log_level=os.getenv('LOG_LEVEL', 'INFO'),
+            log_repeat_interval=float(os.getenv('LOG_REPEAT_INTERVAL', '60')),
+            dedup_window=int(os.getenv('DEDUP_WINDOW', '604800')),
+            dedup_max_entries=int(os.getenv('DEDUP_MAX_ENTRIES', '100000')),
+            max_concurrency=int(os.getenv('MAX_CONCURRENCY', '32')),
+            max_host_concurrency=int(os.getenv('MAX_HOST_CONCURRENCY', '4')),
+            fetch_timeout=float(os.getenv('FETCH_TIMEOUT', '60'))
+        )
+
+        # WebSub push ingestion is optional
+        self.websub = WebSubConfig(
+            callback_url=os.getenv('WEBSUB_CALLBACK_URL') or None,
+            host=os.getenv('WEBSUB_HOST', '0.0.0.0'),
+            port=int(os.getenv('WEBSUB_PORT', '8080')),
+            lease_seconds=int(os.getenv('WEBSUB_LEASE_SECONDS', '86400')),
+            poll_interval=int(os.getenv('PUSH_POLL_INTERVAL', '3600'))
+        )
+
+        # Read-only query API is optional
+        api_port = os.getenv('API_PORT')
+        self.api = ApiConfig(
+            port=int(api_port) if api_port else None,
+            host=os.getenv('API_HOST', '127.0.0.1'),
+            history_size=int(os.getenv('API_HISTORY_SIZE', '50'))
         )
         
     @classmethod
@@ -0,0 +1,138 @@
+import json
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Iterator, Optional, Tuple
+
+# Structured fields that callers may attach through ``extra=...``
+STRUCTURED_FIELDS = ("source", "stage", "duration", "suppressed")
+
+class JsonFormatter(logging.Formatter):
+    """Formats log records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                payload[field] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+
+        return json.dumps(payload, default=str)
+
+class RepeatFilter(logging.Filter):
+    """Rate-limits identical warnings and errors
+
+    The first occurrence of a message is always let through. Repeats within
+    ``interval`` seconds are dropped and counted; the next record let through
+    for that message carries the number of dropped copies in ``suppressed``.
+    """
+
+    def __init__(self, interval: float = 60.0, max_tracked: int = 1024):
+        super().__init__()
+        self.interval = interval
+        self.max_tracked = max_tracked
+        self._seen: Dict[Tuple[str, int, str], Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING or self.interval <= 0:
+            return True
+
+        key = (record.name, record.levelno, record.getMessage())
+        now = time.monotonic()
+        with self._lock:
+            last_emit, suppressed = self._seen.get(key, (None, 0))
+            if last_emit is not None and now - last_emit < self.interval:
+                self._seen[key] = (last_emit, suppressed + 1)
+                return False
+
+            if len(self._seen) >= self.max_tracked and key not in self._seen:
+                self._seen.clear()
+            self._seen[key] = (now, 0)
+
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+class DeferredQueueHandler(QueueHandler):
+    """Queue handler that leaves formatting to the listener thread
+
+    The stock ``QueueHandler`` formats every record before enqueueing it,
+    which puts the formatting cost back on the caller. Here only the message
+    arguments are merged so the record is safe to hand over; the JSON
+    serialisation happens in the background thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # Tracebacks reference live frames, render them while they are valid
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+def setup_logging(
+    log_file: str,
+    log_level: str = "INFO",
+    repeat_interval: float = 60.0
+) -> QueueListener:
+    """Route the root logger through a queue drained by a background thread
+
+    Returns the started listener; call ``stop()`` on it at shutdown so the
+    remaining records are flushed to disk.
+    """
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setFormatter(JsonFormatter())
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(RepeatFilter(interval=repeat_interval))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(getattr(logging, log_level.upper(), logging.INFO))
+
+    listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    return listener
+
+@contextmanager
+def log_stage(
+    source: str,
+    stage: str,
+    level: int = logging.DEBUG,
+    logger: Optional[logging.Logger] = None
+) -> Iterator[None]:
+    """Log how long a stage of work took for a given source
+
+    Nothing is recorded when ``level`` is disabled, so wrapping hot paths
+    costs no more than a clock read.
+    """
+    logger = logger or logging.getLogger()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if logger.isEnabledFor(level):
+            duration = round(time.perf_counter() - start, 4)
+            logger.log(
+                level, "%s finished for %s", stage, source,
+                extra={"source": source, "stage": stage, "duration": duration}
+            )
@@ -31,10 +31,10 @@ class NotificationHandler:
             async with aiohttp.ClientSession() as session:
                 async with session.post(url, data=data) as response:
                     if response.status != 200:
-                        logging.error(f"Failed to send Telegram message: {response.status}")
+                        logging.error("Failed to send Telegram message: %s", response.status)
                         return False
                     return True
                     
         except Exception as e:
-            logging.error(f"Error sending Telegram message: {e}")
+            logging.error("Error sending Telegram message: %s", e)
             return False
\ No newline at end of file
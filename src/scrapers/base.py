@@ -18,6 +18,12 @@ class BaseScraper(ABC):
     def __init__(self, url: str, storage_key: str):
         self.url = url
         self.storage_key = storage_key
+        # HTTP status of the most recent fetch, if the scraper knows it
+        self.last_status: Optional[int] = None
+        # Seconds the page request took, None when no full page was requested
+        self.last_latency: Optional[float] = None
+        # Sources sharing a group (mirrors of one series) share item ids
+        self.dedup_group: Optional[str] = None
         
     @abstractmethod
     async def fetch_latest(self) -> Optional[ScrapedItem]:
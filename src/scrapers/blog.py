@@ -1,67 +1,140 @@
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional, Tuple
 import logging
+import re
+import time
+import aiohttp
 import feedparser
 from urllib.parse import urljoin
 
 from .base import BaseScraper, ScrapedItem
 
+# Matches entries of an HTTP ``Link`` header such as ``<https://hub>; rel="hub"``
+LINK_HEADER = re.compile(r'<([^>]+)>\s*;\s*rel="?([^";]+)"?')
+
 class BlogScraper(BaseScraper):
     """Scraper for blog RSS/Atom feeds"""
-    
+
     def __init__(self, feed_url: str, site_name: str):
         super().__init__(
             url=feed_url,
             storage_key=f"blog_{site_name}"
         )
         self.site_name = site_name
-        
+        # WebSub hub advertised by the feed, filled in on every fetch
+        self.hub_url: Optional[str] = None
+        self.topic_url: Optional[str] = None
+
     async def fetch_latest(self) -> Optional[ScrapedItem]:
+        self.last_status = None
+        self.last_latency = None
         try:
-            feed = feedparser.parse(self.url)
-            
-            if not feed.entries:
-                logging.error(f"No entries found in feed: {self.url}")
+            # Downloaded here rather than by feedparser so cancelling the
+            # check also stops the request
+            async with aiohttp.ClientSession() as session:
+                start = time.monotonic()
+                async with session.get(self.url) as response:
+                    self.last_status = response.status
+                    body = await response.read()
+                    self.last_latency = time.monotonic() - start
+                    headers = {}
+                    for name, value in response.headers.items():
+                        name = name.lower()
+                        headers[name] = f"{headers[name]}, {value}" if name in headers else value
+
+            if response.status != 200:
+                logging.error(
+                    "Failed to fetch %s: %s", self.url, response.status,
+                    extra={"source": self.storage_key, "stage": "fetch"}
+                )
                 return None
-                
-            latest_entry = feed.entries[0]
-            
-            # Get the published date, fallback to current time if not available
-            try:
-                timestamp = datetime(*latest_entry.published_parsed[:6])
-            except (AttributeError, TypeError):
-                timestamp = datetime.now()
-                
-            return ScrapedItem(
-                id=latest_entry.id if hasattr(latest_entry, 'id') else latest_entry.link,
-                title=latest_entry.title,
-                url=latest_entry.link,
-                timestamp=timestamp,
-                content={
-                    "author": latest_entry.get("author", "Unknown"),
-                    "summary": latest_entry.get("summary", ""),
-                    "tags": [tag.term for tag in latest_entry.get("tags", [])]
-                }
+
+            feed = feedparser.parse(body, response_headers=headers)
+            self.hub_url, self.topic_url = self.discover_hub(feed)
+            return self.parse_feed(feed)
+
+        except Exception as e:
+            logging.error(
+                "Error fetching blog feed: %s", e,
+                extra={"source": self.storage_key, "stage": "fetch"}
             )
-            
+            return None
+
+    def ingest(self, body: bytes) -> Optional[ScrapedItem]:
+        """Build the latest item from a feed document pushed by a hub"""
+        try:
+            return self.parse_feed(feedparser.parse(body))
         except Exception as e:
-            logging.error(f"Error fetching blog feed: {e}")
+            logging.error(
+                "Error parsing pushed feed: %s", e,
+                extra={"source": self.storage_key, "stage": "push"}
+            )
             return None
-            
+
+    def discover_hub(self, feed: Any) -> Tuple[Optional[str], Optional[str]]:
+        """Find the WebSub hub and topic URLs advertised by a feed"""
+        links = {}
+
+        headers = feed.get("headers", {})
+        link_header = headers.get("link") if isinstance(headers, dict) else None
+        if isinstance(link_header, str):
+            for href, rels in LINK_HEADER.findall(link_header):
+                for rel in rels.split():
+                    links.setdefault(rel, href)
+
+        for link in feed.feed.get("links", []):
+            rel, href = link.get("rel"), link.get("href")
+            if rel in ("hub", "self") and href:
+                links.setdefault(rel, href)
+
+        hub = links.get("hub")
+        if not hub:
+            return None, None
+        return urljoin(self.url, hub), urljoin(self.url, links.get("self", self.url))
+
+    def parse_feed(self, feed: Any) -> Optional[ScrapedItem]:
+        """Build the latest item from a parsed feed"""
+        if not feed.entries:
+            logging.error(
+                "No entries found in feed: %s", self.url,
+                extra={"source": self.storage_key, "stage": "parse"}
+            )
+            return None
+
+        latest_entry = feed.entries[0]
+
+        # Get the published date, fallback to current time if not available
+        try:
+            timestamp = datetime(*latest_entry.published_parsed[:6])
+        except (AttributeError, TypeError):
+            timestamp = datetime.now()
+
+        return ScrapedItem(
+            id=latest_entry.id if hasattr(latest_entry, 'id') else latest_entry.link,
+            title=latest_entry.title,
+            url=latest_entry.link,
+            timestamp=timestamp,
+            content={
+                "author": latest_entry.get("author", "Unknown"),
+                "summary": latest_entry.get("summary", ""),
+                "tags": [tag.term for tag in latest_entry.get("tags", [])]
+            }
+        )
+
     def get_item_id(self, item: ScrapedItem) -> str:
         return item.id
-        
+
     def format_notification(self, item: ScrapedItem) -> str:
         return (
             f"New post on {self.site_name}!\n"
             f"Title: {item.title}\n"
             f"Read here: {item.url}"
         )
-        
+
     def validate_item(self, item: ScrapedItem) -> bool:
         return bool(
             item.id and
             item.title and
             item.url and
             item.url.startswith(("http://", "https://"))
-        )
\ No newline at end of file
+        )
@@ -1,77 +1,59 @@
-import math
-from datetime import datetime
 from typing import Optional
-import logging
-import aiohttp
-from bs4 import BeautifulSoup
 
-from .base import BaseScraper, ScrapedItem
+from .base import ScrapedItem
+from .probe import EndpointProbe, HeadProbe, RangeProbe, TieredProber
+from .selector import SelectorConfig, SelectorScraper
 
-class MangaScraper(BaseScraper):
+MANGA_SELECTORS = SelectorConfig(
+    item_selector="li[data-num]",
+    number_attribute="data-num",
+    skip_patterns=("RAW", "Oneshot"),
+    parse_only="li",
+    number_key="chapter_number",
+    title_template="{manga_title} Chapter {number}",
+    url_template="{base_url}/{manga}-{number}"
+)
+
+class MangaScraper(SelectorScraper):
     """Scraper for manga chapters"""
-    
-    def __init__(self, manga_name: str, base_url: str):
+
+    def __init__(
+        self,
+        manga_name: str,
+        base_url: str,
+        probe_url: Optional[str] = None,
+        dedup_group: Optional[str] = None  # shared by mirrors of the same series
+    ):
+        # Cheapest first; probe_url may point at a sitemap or chapter-count API
+        probes = [HeadProbe(), RangeProbe()]
+        if probe_url:
+            probes.append(EndpointProbe(probe_url))
+
         super().__init__(
+            name=manga_name,
             url=f"{base_url}/manga/{manga_name}",
-            storage_key=f"manga_{manga_name}"
+            config=MANGA_SELECTORS,
+            storage_key=f"manga_{manga_name}",
+            context={
+                "manga": manga_name,
+                "manga_title": manga_name.title(),
+                "base_url": base_url
+            },
+            prober=TieredProber(probes)
         )
         self.manga_name = manga_name
         self.base_url = base_url
-        
-    async def fetch_latest(self) -> Optional[ScrapedItem]:
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.url) as response:
-                    if response.status != 200:
-                        logging.error(f"Failed to fetch {self.url}: {response.status}")
-                        return None
-                        
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # Find the chapter list
-                    chapter_items = soup.find_all('li', attrs={"data-num": True})
-                    if not chapter_items:
-                        logging.error("Chapter list not found")
-                        return None
+        self.dedup_group = dedup_group
 
-                    # Extract data-num attributes and find the latest
-                    list_chapter = [li.get('data-num') for li in chapter_items]
-                    # logging.info(f"{list_chapter}")
-                    data_nums = [math.trunc(float(li.get('data-num').split(" ")[0])) for li in chapter_items]
-                    latest_num = max(data_nums) if data_nums else 0
-                    
-                    if latest_num == 0:
-                        return None
-                    latest_chapter = [s for s in list_chapter if str(latest_num) in s]
-                    if "RAW" in latest_chapter[0] or "Oneshot" in latest_chapter[0]:
-                        logging.info(f"Skipping latest chapter {latest_num} due to RAW/Oneshot tag")
-                        return None
-                        
-                    return ScrapedItem(
-                        id=str(latest_num),
-                        title=f"{self.manga_name.title()} Chapter {latest_num}",
-                        url=f"{self.base_url}/{self.manga_name}-{latest_num}",
-                        timestamp=datetime.now(),
-                        content={"chapter_number": latest_num}
-                    )
-                    
-        except Exception as e:
-            logging.error(f"Error fetching manga chapter: {e}")
-            return None
-            
-    def get_item_id(self, item: ScrapedItem) -> str:
-        return str(item.content["chapter_number"])
-        
     def format_notification(self, item: ScrapedItem) -> str:
         return (
             f"¡Nuevo capítulo de {item.title} disponible!\n"
             f"Puedes leerlo aquí: {item.url}"
         )
-        
+
     def validate_item(self, item: ScrapedItem) -> bool:
         return (
             item.id.isdigit() and
             "chapter_number" in item.content and
             isinstance(item.content["chapter_number"], int)
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,226 @@
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Tuple
+import aiohttp
+
+class ProbeUnavailable(Exception):
+    """A probe could not give an answer this time (network error, 5xx...)"""
+
+def _digest(body: bytes) -> str:
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+class ChangeProbe(ABC):
+    """A cheap request whose answer changes when the page does"""
+
+    name: str = "probe"
+
+    @abstractmethod
+    async def signature(self, session: aiohttp.ClientSession, url: str) -> Optional[str]:
+        """Return a value identifying the current page state
+
+        ``None`` means the server does not support this probe at all;
+        ``ProbeUnavailable`` means no answer could be obtained right now.
+        """
+        pass
+
+    def ready(self) -> bool:
+        """Whether the probe has learned enough to be asked"""
+        return True
+
+    def learn(self, offset: Optional[int]) -> bool:
+        """Adjust to a full download; return True if earlier signatures are stale"""
+        return False
+
+class HeadProbe(ChangeProbe):
+    """HEAD request compared on ETag, Last-Modified or Content-Length"""
+
+    name = "head"
+
+    async def signature(self, session: aiohttp.ClientSession, url: str) -> Optional[str]:
+        async with session.head(url, allow_redirects=True) as response:
+            # A client error to HEAD won't go away by asking again
+            if response.status == 501 or (400 <= response.status < 500 and response.status != 429):
+                return None
+            if response.status != 200:
+                raise ProbeUnavailable(f"HEAD returned {response.status}")
+            for header in ("ETag", "Last-Modified", "Content-Length"):
+                if value := response.headers.get(header):
+                    return f"{header}:{value}"
+            return None
+
+class RangeProbe(ChangeProbe):
+    """Ranged GET of the page region holding the item list
+
+    The region is learned from where the list was found in the last full
+    download, so only ``length`` bytes are transferred per probe.
+    """
+
+    name = "range"
+
+    def __init__(self, length: int = 8192, margin: int = 512):
+        self.length = length
+        self.margin = margin
+        self.start: Optional[int] = None
+
+    def ready(self) -> bool:
+        return self.start is not None
+
+    def learn(self, offset: Optional[int]) -> bool:
+        if offset is None:
+            return False
+        # Small drifts inside the window don't need a new region
+        if self.start is not None and self.start <= offset < self.start + self.length // 2:
+            return False
+        self.start = max(0, offset - self.margin)
+        return True
+
+    async def signature(self, session: aiohttp.ClientSession, url: str) -> Optional[str]:
+        if self.start is None:
+            raise ProbeUnavailable("list region not learned yet")
+
+        end = self.start + self.length - 1
+        # Offsets refer to the uncompressed page, and a slice of a gzip
+        # stream can't be decoded anyway
+        headers = {"Range": f"bytes={self.start}-{end}", "Accept-Encoding": "identity"}
+        async with session.get(url, headers=headers) as response:
+            if response.status == 206:
+                return _digest(await response.read())
+            if response.status in (200, 416):
+                return None  # Range ignored or refused, the probe would cost a full download
+            raise ProbeUnavailable(f"ranged GET returned {response.status}")
+
+class EndpointProbe(ChangeProbe):
+    """GET of a lightweight resource such as a sitemap or chapter-count API"""
+
+    name = "endpoint"
+
+    def __init__(self, url: str):
+        self.url = url
+
+    async def signature(self, session: aiohttp.ClientSession, url: str) -> Optional[str]:
+        async with session.get(self.url) as response:
+            if response.status in (404, 410):
+                return None
+            if response.status != 200:
+                raise ProbeUnavailable(f"endpoint returned {response.status}")
+            return _digest(await response.read())
+
+@dataclass
+class ProbeStats:
+    """How useful a probe has been for one source"""
+    probes: int = 0           # probe requests answered
+    failures: int = 0         # consecutive requests without an answer
+    skips: int = 0            # full downloads avoided
+    false_positives: int = 0  # reported a change the download didn't confirm
+    misses: int = 0           # reported no change while the item had changed
+    disabled: Optional[str] = None
+
+class TieredProber:
+    """Picks the cheapest working probe for a source and learns which to drop
+
+    Probes are tried in order and the first one that answers decides whether
+    a full download is needed; a probe without an answer hands over to the
+    next tier. Probes the server does not support, that miss a change, that
+    fail ``max_failures`` times in a row, or whose answers mostly turn out to
+    be false alarms are disabled. A full download is forced after
+    ``max_skips`` consecutive skips so a probe that stopped noticing changes
+    is caught.
+    """
+
+    def __init__(
+        self,
+        probes: List[ChangeProbe],
+        max_skips: int = 12,
+        min_samples: int = 6,
+        max_false_positive_rate: float = 0.5,
+        max_failures: int = 3
+    ):
+        self.probes = probes
+        self.max_skips = max_skips
+        self.max_failures = max_failures
+        self.min_samples = min_samples
+        self.max_false_positive_rate = max_false_positive_rate
+        self.stats: Dict[str, ProbeStats] = {probe.name: ProbeStats() for probe in probes}
+        self._signatures: Dict[str, str] = {}
+        self._skipped = 0
+        self._verdict: Optional[Tuple[str, bool]] = None  # (probe, reported change)
+
+    def active(self) -> List[ChangeProbe]:
+        return [probe for probe in self.probes if not self.stats[probe.name].disabled]
+
+    def disable(self, name: str, reason: str):
+        self.stats[name].disabled = reason
+        self._signatures.pop(name, None)
+        logging.info("Disabling %s probe: %s", name, reason, extra={"stage": "probe"})
+
+    async def should_fetch(self, session: aiohttp.ClientSession, url: str) -> bool:
+        """Ask the probes whether a full download is worth it"""
+        self._verdict = None
+        for probe in self.active():
+            if not probe.ready():
+                continue
+
+            stats = self.stats[probe.name]
+            try:
+                signature = await probe.signature(session, url)
+            except Exception as e:
+                logging.debug("%s probe unavailable for %s: %s", probe.name, url, e,
+                              extra={"stage": "probe"})
+                stats.failures += 1
+                if stats.failures >= self.max_failures:
+                    self.disable(probe.name, f"failed {stats.failures} times in a row")
+                continue
+
+            stats.failures = 0
+            stats.probes += 1
+            if signature is None:
+                self.disable(probe.name, "not supported by server")
+                continue
+
+            previous = self._signatures.get(probe.name)
+            self._signatures[probe.name] = signature
+            if previous is None:
+                return True  # first answer only sets the baseline
+
+            changed = signature != previous
+            if not changed and self._skipped < self.max_skips:
+                self._skipped += 1
+                stats.skips += 1
+                return False
+
+            self._verdict = (probe.name, changed)
+            return True
+
+        return True
+
+    def record_fetch(self, changed: bool, offset: Optional[int] = None):
+        """Feed back the outcome of a full download
+
+        ``changed`` tells whether the latest item differed from the previous
+        download, ``offset`` is the byte position of the item list in the page.
+        """
+        self._skipped = 0
+        for probe in self.active():
+            if probe.learn(offset):
+                self._signatures.pop(probe.name, None)
+
+        if self._verdict is None:
+            return
+        name, reported = self._verdict
+        self._verdict = None
+        stats = self.stats[name]
+
+        if not reported and changed:
+            stats.misses += 1
+            self.disable(name, "missed a change")
+        elif reported and not changed:
+            stats.false_positives += 1
+            if (stats.probes >= self.min_samples and
+                    stats.false_positives / stats.probes > self.max_false_positive_rate):
+                self.disable(name, "too many false alarms")
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per-probe statistics for inspection"""
+        return {name: asdict(stats) for name, stats in self.stats.items()}
@@ -0,0 +1,232 @@
+import math
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+import logging
+import aiohttp
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.element import Tag
+
+from .base import BaseScraper, ScrapedItem
+from .probe import TieredProber
+
+# Pseudo-attribute selecting the element's text instead of an HTML attribute
+TEXT = "#text"
+
+@dataclass(frozen=True)
+class SelectorConfig:
+    """Declarative description of where the latest item lives on a page
+
+    Configs are immutable and hashable so identical layouts share one
+    compiled ``ExtractionPlan``.
+    """
+    item_selector: str                       # CSS selector matching every candidate item
+    number_attribute: str = TEXT             # attribute holding the item number
+    number_pattern: str = r"\d+(?:\.\d+)?"   # regex picking the number out of that value
+    skip_patterns: Tuple[str, ...] = ()      # regexes marking values to ignore (e.g. RAW)
+    fields: Tuple[Tuple[str, str], ...] = () # extra (content key, attribute) pairs to extract
+    parse_only: Optional[str] = None         # tag name to restrict HTML parsing to
+    number_key: str = "number"
+    title_template: str = "{name} #{number}"
+    url_template: str = "{url}"
+
+@dataclass(frozen=True)
+class Extraction:
+    """Result of running an extraction plan over a page"""
+    number: int
+    raw: str
+    fields: Dict[str, Optional[str]]
+    position: Optional[Tuple[int, int]] = None  # (line, column) where the item list starts
+
+def _attribute_reader(attribute: str) -> Callable[[Tag], Optional[str]]:
+    if attribute == TEXT:
+        return lambda tag: tag.get_text(" ", strip=True)
+
+    def read(tag: Tag) -> Optional[str]:
+        value = tag.get(attribute)
+        if isinstance(value, list):  # multi-valued attributes such as class
+            value = " ".join(value)
+        return value
+    return read
+
+class ExtractionPlan:
+    """A ``SelectorConfig`` compiled into ready-to-run matchers"""
+
+    def __init__(self, config: SelectorConfig):
+        self.config = config
+        self.selector = soupsieve.compile(config.item_selector)
+        self.strainer = SoupStrainer(config.parse_only) if config.parse_only else None
+        self.number = re.compile(config.number_pattern)
+        self.skip = (
+            re.compile("|".join(f"(?:{p})" for p in config.skip_patterns))
+            if config.skip_patterns else None
+        )
+        self.read_number = _attribute_reader(config.number_attribute)
+        self.readers = tuple(
+            (key, _attribute_reader(attribute)) for key, attribute in config.fields
+        )
+
+    def extract(self, html: str) -> Optional[Extraction]:
+        """Return the highest-numbered item that is not skipped"""
+        soup = BeautifulSoup(html, "html.parser", parse_only=self.strainer)
+
+        best: Optional[Tuple[int, str, Tag]] = None
+        first: Optional[Tag] = None
+        for tag in self.selector.iselect(soup):
+            if first is None:
+                first = tag
+            raw = self.read_number(tag)
+            if not raw or (self.skip and self.skip.search(raw)):
+                continue
+            match = self.number.search(raw)
+            if not match:
+                continue
+            number = math.trunc(float(match.group(0)))
+            if best is None or number > best[0]:
+                best = (number, raw, tag)
+
+        if best is None:
+            return None
+
+        number, raw, tag = best
+        return Extraction(
+            number=number,
+            raw=raw,
+            fields={key: read(tag) for key, read in self.readers},
+            position=(first.sourceline, first.sourcepos) if first.sourceline else None
+        )
+
+def _byte_offset(html: str, position: Optional[Tuple[int, int]], encoding: str) -> Optional[int]:
+    """Convert a (line, column) position in a page into a byte offset
+
+    ``encoding`` must be the one the page was decoded with, so the offset
+    lines up with the uncompressed bytes a ranged request returns.
+    """
+    if position is None:
+        return None
+    line, column = position
+    start = 0
+    for _ in range(line - 1):
+        start = html.find("\n", start) + 1
+        if start == 0:
+            return None
+    return len(html[:start + column].encode(encoding, errors="replace"))
+
+@lru_cache(maxsize=None)
+def compile_plan(config: SelectorConfig) -> ExtractionPlan:
+    """Compile a config once; equal configs return the same plan"""
+    return ExtractionPlan(config)
+
+class SelectorScraper(BaseScraper):
+    """Generic scraper driven by a ``SelectorConfig``"""
+
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        config: SelectorConfig,
+        storage_key: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+        prober: Optional[TieredProber] = None
+    ):
+        super().__init__(
+            url=url,
+            storage_key=storage_key or f"site_{name}"
+        )
+        self.name = name
+        self.config = config
+        self.plan = compile_plan(config)
+        # Values available to the title/url templates
+        self.context = {"name": name, "url": url, **(context or {})}
+        # Cheap change probes consulted before downloading the full page
+        self.prober = prober
+        self._last_item: Optional[ScrapedItem] = None
+
+    async def fetch_latest(self) -> Optional[ScrapedItem]:
+        self.last_status = None
+        self.last_latency = None
+        try:
+            async with aiohttp.ClientSession() as session:
+                if (self.prober and self._last_item and
+                        not await self.prober.should_fetch(session, self.url)):
+                    logging.debug(
+                        "Probe reports no change for %s", self.url,
+                        extra={"source": self.storage_key, "stage": "probe"}
+                    )
+                    return self._last_item
+
+                start = time.monotonic()
+                async with session.get(self.url) as response:
+                    self.last_status = response.status
+                    if response.status != 200:
+                        self.last_latency = time.monotonic() - start
+                        logging.error(
+                            "Failed to fetch %s: %s", self.url, response.status,
+                            extra={"source": self.storage_key, "stage": "fetch"}
+                        )
+                        return None
+
+                    html = await response.text()
+                    self.last_latency = time.monotonic() - start
+                    extraction = self.plan.extract(html)
+                    item = self.make_item(extraction)
+                    if item is None:
+                        return None
+
+                    if self.prober:
+                        self.prober.record_fetch(
+                            changed=self._last_item is None or item.id != self._last_item.id,
+                            offset=_byte_offset(html, extraction.position, response.get_encoding())
+                        )
+                    self._last_item = item
+                    return item
+
+        except Exception as e:
+            logging.error(
+                "Error fetching %s: %s", self.url, e,
+                extra={"source": self.storage_key, "stage": "fetch"}
+            )
+            return None
+
+    def build_item(self, html: str) -> Optional[ScrapedItem]:
+        """Run the extraction plan over a page and build the item"""
+        return self.make_item(self.plan.extract(html))
+
+    def make_item(self, extraction: Optional[Extraction]) -> Optional[ScrapedItem]:
+        """Build the item from an extraction result"""
+        if extraction is None:
+            logging.error(
+                "No item matched %s", self.config.item_selector,
+                extra={"source": self.storage_key, "stage": "parse"}
+            )
+            return None
+
+        values = {**self.context, **extraction.fields, "number": extraction.number}
+        return ScrapedItem(
+            id=str(extraction.number),
+            title=self.config.title_template.format_map(values),
+            url=self.config.url_template.format_map(values),
+            timestamp=datetime.now(),
+            content={self.config.number_key: extraction.number, **extraction.fields}
+        )
+
+    def get_item_id(self, item: ScrapedItem) -> str:
+        return str(item.content[self.config.number_key])
+
+    def format_notification(self, item: ScrapedItem) -> str:
+        return (
+            f"New update on {self.name}!\n"
+            f"Title: {item.title}\n"
+            f"Read here: {item.url}"
+        )
+
+    def validate_item(self, item: ScrapedItem) -> bool:
+        return (
+            item.id.isdigit() and
+            isinstance(item.content.get(self.config.number_key), int) and
+            item.url.startswith(("http://", "https://"))
+        )
@@ -0,0 +1,112 @@
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from ..scrapers.base import ScrapedItem
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref_src"}
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+def normalize_url(url: str) -> str:
+    """Reduce a URL to the form shared by every link to the same page
+
+    Scheme and host are lower-cased, ``www.``, default ports, fragments,
+    tracking parameters and trailing slashes are dropped, and the remaining
+    query parameters are sorted. The scheme itself is discarded so http and
+    https links compare equal.
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and str(parts.port) != DEFAULT_PORTS.get(parts.scheme.lower()):
+        host = f"{host}:{parts.port}"
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    )
+    path = re.sub(r"/{2,}", "/", parts.path).rstrip("/")
+    return urlunsplit(("", host, path, urlencode(query), ""))
+
+def normalize_title(title: str) -> str:
+    """Case-fold a title and collapse punctuation and whitespace"""
+    return " ".join(re.sub(r"[\W_]+", " ", title.casefold()).split())
+
+def fingerprint(kind: str, value: str) -> int:
+    """64-bit hash of a normalised value"""
+    digest = hashlib.blake2b(f"{kind}:{value}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+class DedupIndex:
+    """Bounded, time-windowed index of items already notified
+
+    Each item is reduced to a 64-bit fingerprint of its normalised URL and,
+    optionally, one of its title together with the link's host. Titles alone
+    are never a match: unrelated sources share titles like "Weekly links",
+    and a lost notification is worse than a repeated one. Mirrors on other
+    hosts are matched through a dedup group the sources opt into, which is
+    fingerprinted together with the item id.
+
+    Fingerprints are kept in insertion order so expired or excess entries
+    are evicted from the front in O(1) per entry.
+    """
+
+    def __init__(
+        self,
+        window: float = 7 * 24 * 3600,  # 1 week
+        max_entries: int = 100_000,
+        match_titles: bool = False,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.window = window
+        self.max_entries = max_entries
+        self.match_titles = match_titles
+        self.clock = clock
+        self._entries: "OrderedDict[int, float]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def fingerprints(self, item: ScrapedItem, group: Optional[str] = None) -> List[int]:
+        url = normalize_url(item.url)
+        keys = [fingerprint("url", url)]
+        title = normalize_title(item.title) if self.match_titles else ""
+        if title:
+            host = url.lstrip("/").split("/", 1)[0]
+            keys.append(fingerprint("title", f"{host} {title}"))
+        if group:
+            keys.append(fingerprint("group", f"{group} {item.id}"))
+        return keys
+
+    def _evict(self, now: float):
+        entries = self._entries
+        cutoff = now - self.window
+        while entries:
+            key, seen_at = next(iter(entries.items()))
+            if seen_at >= cutoff and len(entries) <= self.max_entries:
+                break
+            entries.popitem(last=False)
+
+    def seen(self, item: ScrapedItem, group: Optional[str] = None) -> bool:
+        """Whether the item matches one recorded within the window"""
+        self._evict(self.clock())
+        return any(key in self._entries for key in self.fingerprints(item, group))
+
+    def add(self, item: ScrapedItem, group: Optional[str] = None):
+        """Record an item, refreshing it if it was already known"""
+        now = self.clock()
+        for key in self.fingerprints(item, group):
+            self._entries[key] = now
+            self._entries.move_to_end(key)
+        self._evict(now)
+
+    def check_and_add(self, item: ScrapedItem, group: Optional[str] = None) -> bool:
+        """Record an item and return whether it was a duplicate"""
+        duplicate = self.seen(item, group)
+        self.add(item, group)
+        return duplicate
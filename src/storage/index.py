@@ -0,0 +1,99 @@
+import secrets
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from .handler import StorageHandler
+
+@dataclass
+class SourceState:
+    """What the bot currently knows about one source"""
+    key: str
+    history: Deque[Dict[str, Any]]
+    latest: Optional[Dict[str, Any]] = None
+    checks: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    last_check: Optional[str] = None
+    last_success: Optional[str] = None
+    last_error: Optional[str] = None
+    # Bumped separately so health updates don't invalidate cached items
+    item_version: int = 0
+    health_version: int = 0
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            "status": "ok" if self.consecutive_failures == 0 else "failing",
+            "checks": self.checks,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "last_check": self.last_check,
+            "last_success": self.last_success,
+            "last_error": self.last_error,
+        }
+
+class StateIndex:
+    """In-memory view of the latest item, history and health per source
+
+    Updated in place by ``BotManager`` as items are stored, so readers never
+    touch the storage files. Stored dicts are replaced, never mutated, which
+    keeps anything handed out to readers consistent.
+
+    Versions restart with every process, so ``boot_id`` tells the versions
+    of one run from those of the next.
+    """
+
+    def __init__(self, history_size: int = 50):
+        self.history_size = history_size
+        self.sources: Dict[str, SourceState] = {}
+        self.version = 0  # bumped on any change
+        self.boot_id = secrets.token_hex(4)
+
+    def _state(self, key: str) -> SourceState:
+        state = self.sources.get(key)
+        if state is None:
+            state = SourceState(key=key, history=deque(maxlen=self.history_size))
+            self.sources[key] = state
+        return state
+
+    def load(self, storage: StorageHandler, keys: Iterable[str]):
+        """Seed the index with what is already in storage"""
+        for key in keys:
+            state = self._state(key)
+            data = storage.get_latest(key)
+            if data and state.latest is None:
+                state.latest = dict(data)
+                state.history.appendleft(state.latest)
+                state.item_version += 1
+        self.version += 1
+
+    def record_item(self, key: str, data: Dict[str, Any]):
+        """Record a newly stored item for a source"""
+        state = self._state(key)
+        state.latest = dict(data)
+        state.history.appendleft(state.latest)
+        state.item_version += 1
+        self.version += 1
+
+    def record_check(self, key: str, ok: bool, error: Optional[str] = None):
+        """Record the outcome of a check for a source"""
+        state = self._state(key)
+        now = datetime.now().isoformat()
+        state.checks += 1
+        state.last_check = now
+        if ok:
+            state.consecutive_failures = 0
+            state.last_success = now
+        else:
+            state.failures += 1
+            state.consecutive_failures += 1
+            state.last_error = error
+        state.health_version += 1
+        self.version += 1
+
+    def get(self, key: str) -> Optional[SourceState]:
+        return self.sources.get(key)
+
+    def keys(self) -> List[str]:
+        return sorted(self.sources)
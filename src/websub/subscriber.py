@@ -0,0 +1,256 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+import secrets
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Set
+from urllib.parse import urlparse
+import aiohttp
+from aiohttp import web
+
+from ..scrapers.base import BaseScraper, ScrapedItem
+
+# Signature algorithms a hub may use in ``X-Hub-Signature``
+SIGNATURE_METHODS = {
+    "sha1": hashlib.sha1,
+    "sha256": hashlib.sha256,
+    "sha384": hashlib.sha384,
+    "sha512": hashlib.sha512,
+}
+
+def secure_hub(hub_url: str) -> bool:
+    """Whether a hub can be sent a signing secret (only over https)"""
+    return urlparse(hub_url).scheme == "https"
+
+@dataclass
+class Subscription:
+    """State of one WebSub subscription"""
+    scraper: BaseScraper
+    hub_url: str
+    topic_url: str
+    token: str
+    secret: str
+    requested_at: float
+    verified: bool = False
+    expires_at: Optional[float] = None
+
+class WebSubSubscriber:
+    """Subscribes to WebSub hubs and receives pushed feed updates
+
+    Scrapers advertising a hub (``hub_url``/``topic_url``) are subscribed with
+    a callback under ``callback_url``. Verified content deliveries are parsed
+    with the scraper's ``ingest`` method and handed to ``on_item`` in a
+    background task, so the hub gets its ``202`` without waiting on
+    notifications. Only ``https`` hubs are subscribed: the spec forbids
+    sending the signing secret over plain http, and an unsigned delivery
+    can't be trusted, so sources behind other hubs keep being polled.
+    """
+
+    def __init__(
+        self,
+        callback_url: str,
+        host: str = "0.0.0.0",
+        port: int = 8080,
+        lease_seconds: int = 86400,
+        renew_margin: int = 3600,
+        retry_after: int = 300,
+        hub_timeout: float = 10.0,
+        on_item: Optional[Callable[[BaseScraper, ScrapedItem], Awaitable[None]]] = None
+    ):
+        self.callback_url = callback_url.rstrip("/")
+        self.host = host
+        self.port = port
+        self.lease_seconds = lease_seconds
+        self.renew_margin = renew_margin
+        self.retry_after = retry_after
+        self.hub_timeout = hub_timeout
+        self.on_item = on_item
+        self.subscriptions: Dict[str, Subscription] = {}  # keyed by storage key
+        self._by_token: Dict[str, Subscription] = {}
+        self._runner: Optional[web.AppRunner] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def build_app(self) -> web.Application:
+        prefix = urlparse(self.callback_url).path
+        app = web.Application()
+        app.router.add_get(prefix + "/{token}", self.handle_verification)
+        app.router.add_post(prefix + "/{token}", self.handle_delivery)
+        return app
+
+    async def start(self):
+        """Start the callback endpoint"""
+        self._runner = web.AppRunner(self.build_app())
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logging.info("WebSub callback listening on %s:%s", self.host, self.port)
+
+    async def stop(self):
+        """Stop the callback endpoint once accepted deliveries are handled"""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def is_subscribed(self, scraper: BaseScraper) -> bool:
+        """Whether the scraper currently has a verified, unexpired lease"""
+        sub = self.subscriptions.get(scraper.storage_key)
+        return bool(
+            sub and sub.verified and
+            (sub.expires_at is None or sub.expires_at > time.time())
+        )
+
+    async def maintain(self, scrapers: Iterable[BaseScraper]):
+        """Subscribe new hubs and renew leases that are about to expire
+
+        Hubs are contacted concurrently, each within ``hub_timeout``, so a
+        slow hub can't hold up the polling cycle.
+        """
+        now = time.time()
+        requests = []
+        for scraper in scrapers:
+            hub_url = getattr(scraper, "hub_url", None)
+            topic_url = getattr(scraper, "topic_url", None)
+            if not hub_url or not topic_url or not secure_hub(hub_url):
+                continue
+
+            sub = self.subscriptions.get(scraper.storage_key)
+            if sub and sub.hub_url == hub_url and sub.topic_url == topic_url:
+                if sub.verified and sub.expires_at and sub.expires_at - now > self.renew_margin:
+                    continue
+                if not sub.verified and now - sub.requested_at < self.retry_after:
+                    continue
+
+            requests.append(self.subscribe(scraper, hub_url, topic_url))
+
+        await asyncio.gather(*requests)
+
+    async def subscribe(self, scraper: BaseScraper, hub_url: str, topic_url: str) -> bool:
+        """Send a subscription request to the hub"""
+        previous = self.subscriptions.get(scraper.storage_key)
+        renewing = bool(
+            previous and previous.hub_url == hub_url and previous.topic_url == topic_url
+        )
+        if previous and not renewing:
+            self._by_token.pop(previous.token, None)
+
+        # Renewals keep the callback and secret so in-flight deliveries still verify
+        sub = Subscription(
+            scraper=scraper,
+            hub_url=hub_url,
+            topic_url=topic_url,
+            token=previous.token if renewing else secrets.token_urlsafe(12),
+            secret=previous.secret if renewing else secrets.token_hex(20),
+            requested_at=time.time(),
+            verified=renewing and previous.verified,
+            expires_at=previous.expires_at if renewing else None
+        )
+        self.subscriptions[scraper.storage_key] = sub
+        self._by_token[sub.token] = sub
+
+        data = {
+            "hub.mode": "subscribe",
+            "hub.callback": f"{self.callback_url}/{sub.token}",
+            "hub.topic": topic_url,
+            "hub.lease_seconds": str(self.lease_seconds),
+            "hub.secret": sub.secret,
+        }
+        try:
+            timeout = aiohttp.ClientTimeout(total=self.hub_timeout)
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                async with session.post(hub_url, data=data) as response:
+                    if response.status not in (202, 204):
+                        logging.error(
+                            "Hub %s refused subscription: %s", hub_url, response.status,
+                            extra={"source": scraper.storage_key, "stage": "subscribe"}
+                        )
+                        return False
+                    return True
+
+        except Exception as e:
+            logging.error(
+                "Error subscribing to hub %s: %s", hub_url, e,
+                extra={"source": scraper.storage_key, "stage": "subscribe"}
+            )
+            return False
+
+    async def handle_verification(self, request: web.Request) -> web.Response:
+        """Answer the hub's intent verification or denial notice"""
+        sub = self._by_token.get(request.match_info["token"])
+        if sub is None:
+            return web.Response(status=404)
+
+        mode = request.query.get("hub.mode")
+        topic = request.query.get("hub.topic")
+        if topic != sub.topic_url:
+            return web.Response(status=404)
+
+        if mode == "denied":
+            logging.error(
+                "Hub %s denied subscription: %s", sub.hub_url,
+                request.query.get("hub.reason", "no reason given"),
+                extra={"source": sub.scraper.storage_key, "stage": "subscribe"}
+            )
+            sub.verified = False
+            return web.Response(status=200)
+
+        if mode != "subscribe":
+            return web.Response(status=404)
+
+        try:
+            lease = int(request.query.get("hub.lease_seconds", self.lease_seconds))
+        except ValueError:
+            lease = self.lease_seconds
+        sub.verified = True
+        sub.expires_at = time.time() + lease
+        logging.info(
+            "WebSub subscription verified for %s (lease %ss)", sub.topic_url, lease,
+            extra={"source": sub.scraper.storage_key, "stage": "subscribe"}
+        )
+        return web.Response(status=200, text=request.query.get("hub.challenge", ""))
+
+    async def handle_delivery(self, request: web.Request) -> web.Response:
+        """Accept a content distribution request from the hub"""
+        sub = self._by_token.get(request.match_info["token"])
+        if sub is None:
+            return web.Response(status=410)
+
+        body = await request.read()
+        # Per the spec, bad signatures are acknowledged but the content is ignored
+        if not sub.verified or not self.verify_signature(
+            sub.secret, body, request.headers.get("X-Hub-Signature", "")
+        ):
+            logging.warning(
+                "Ignoring unverified WebSub delivery for %s", sub.topic_url,
+                extra={"source": sub.scraper.storage_key, "stage": "push"}
+            )
+            return web.Response(status=202)
+
+        ingest = getattr(sub.scraper, "ingest", None)
+        item = ingest(body) if ingest else None
+        if item and self.on_item:
+            # Hubs time out and redeliver if the reply waits on notifications
+            task = asyncio.create_task(self.on_item(sub.scraper, item))
+            self._tasks.add(task)
+            task.add_done_callback(lambda task: self._finish(task, sub))
+        return web.Response(status=202)
+
+    def _finish(self, task: asyncio.Task, sub: Subscription):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logging.error(
+                "Error handling WebSub delivery for %s: %s", sub.topic_url, task.exception(),
+                extra={"source": sub.scraper.storage_key, "stage": "push"}
+            )
+
+    @staticmethod
+    def verify_signature(secret: str, body: bytes, header: str) -> bool:
+        """Check an ``X-Hub-Signature`` header of the form ``method=hexdigest``"""
+        method, _, signature = header.partition("=")
+        digest = SIGNATURE_METHODS.get(method.lower())
+        if not digest or not signature:
+            return False
+        expected = hmac.new(secret.encode(), body, digest).hexdigest()
+        return hmac.compare_digest(expected, signature)
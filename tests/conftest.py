@@ -29,6 +29,33 @@ def sample_scraped_item():
         content={"test_key": "test_value"}
     )
 
+@pytest.fixture
+def make_item():
+    """Provides a factory for scraped items, numbered posts on test.com by default"""
+    def make(item_id="1", title=None, url=None):
+        return ScrapedItem(
+            id=item_id,
+            title=title or f"Post {item_id}",
+            url=url or f"https://test.com/post/{item_id}",
+            timestamp=datetime(2025, 11, 6, 12, 0, 0),
+            content={}
+        )
+    return make
+
+class FakeClock:
+    """Monotonic clock whose time only moves when a test sets ``now``"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    """Provides a controllable clock for time-windowed components"""
+    return FakeClock()
+
 @pytest.fixture
 def mock_response():
     """Provides a mock response for HTTP requests"""
@@ -1,46 +1,64 @@
 import pytest
-from unittest.mock import patch, AsyncMock
-import feedparser
+from datetime import datetime
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 from src.scrapers.blog import BlogScraper
 
+FEED = """<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0">
+    <channel>
+        <title>Test Blog</title>
+        {items}
+    </channel>
+</rss>
+"""
+
+ITEM = """<item>
+    <guid>test123</guid>
+    <title>Test Post</title>
+    <link>https://test.com/post/1</link>
+    <pubDate>Thu, 06 Nov 2025 12:00:00 GMT</pubDate>
+    <author>Test Author</author>
+    <description>Test summary</description>
+    <category>test</category>
+</item>"""
+
+async def fetch_from_local_feed(body):
+    """Serve a feed from a local server and fetch it with the scraper"""
+    async def feed(request):
+        return web.Response(text=body, content_type="application/rss+xml")
+
+    app = web.Application()
+    app.router.add_get("/feed", feed)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        scraper = BlogScraper(str(server.make_url("/feed")), "Test Blog")
+        return await scraper.fetch_latest()
+    finally:
+        await server.close()
+
 @pytest.mark.asyncio
 async def test_blog_scraper_fetch_latest():
     """Test blog scraper fetching latest post"""
-    # Setup
-    scraper = BlogScraper("https://test.com/feed", "Test Blog")
-    
-    mock_entry = {
-        'id': 'test123',
-        'title': 'Test Post',
-        'link': 'https://test.com/post/1',
-        'published_parsed': (2025, 11, 6, 12, 0, 0),
-        'author': 'Test Author',
-        'summary': 'Test summary',
-        'tags': [type('TestTag', (), {'term': 'test'})()]
-    }
-    
-    with patch('feedparser.parse') as mock_parse:
-        mock_parse.return_value.entries = [mock_entry]
-        result = await scraper.fetch_latest()
-    
+    result = await fetch_from_local_feed(FEED.format(items=ITEM))
+
     # Assert
     assert result is not None
     assert result.id == 'test123'
     assert result.title == 'Test Post'
     assert result.url == 'https://test.com/post/1'
+    assert result.timestamp == datetime(2025, 11, 6, 12, 0, 0)
     assert result.content['author'] == 'Test Author'
     assert result.content['tags'] == ['test']
 
 @pytest.mark.asyncio
-async def test_blog_scraper_no_entries():
+async def test_blog_scraper_no_entries(caplog):
     """Test blog scraper when no entries are found"""
-    scraper = BlogScraper("https://test.com/feed", "Test Blog")
-    
-    with patch('feedparser.parse') as mock_parse:
-        mock_parse.return_value.entries = []
-        result = await scraper.fetch_latest()
-    
+    result = await fetch_from_local_feed(FEED.format(items=""))
+
     assert result is None
+    assert "No entries found in feed" in caplog.text
 
 def test_blog_scraper_format_notification(sample_scraped_item):
     """Test notification formatting"""
@@ -0,0 +1,161 @@
+import pytest
+import asyncio
+from unittest.mock import AsyncMock
+
+from src.bot.concurrency import AIMDLimiter, ConcurrencyController, Outcome
+from src.bot.manager import BotManager
+from src.scrapers.base import BaseScraper
+from src.storage.handler import StorageHandler
+
+def saturate(limiter):
+    limiter.in_flight = int(limiter.limit)
+
+def test_outcome_overload_classification():
+    """Test which responses count as overload signals"""
+    assert not Outcome(status=200).overloaded
+    assert not Outcome(status=404).overloaded
+    assert Outcome(status=429).overloaded
+    assert Outcome(status=503).overloaded
+    assert Outcome(timed_out=True).overloaded
+
+def test_limit_grows_additively_when_saturated():
+    """Test healthy completions raise the limit by about one per round"""
+    limiter = AIMDLimiter(initial=4, maximum=10)
+    for _ in range(4):
+        saturate(limiter)
+        limiter.record(0.1, overloaded=False)
+
+    assert 4.9 < limiter.limit < 5.1
+
+def test_limit_does_not_grow_when_idle():
+    """Test an unused limit is left alone"""
+    limiter = AIMDLimiter(initial=4)
+    for _ in range(20):
+        limiter.record(0.1, overloaded=False)
+
+    assert limiter.limit == 4
+
+def test_overload_halves_once_per_round_trip(clock):
+    """Test a burst of failures counts as a single decrease"""
+    limiter = AIMDLimiter(initial=16, clock=clock)
+    limiter.record(0.5, overloaded=False)
+
+    clock.now = 10
+    for _ in range(5):
+        limiter.record(0.5, overloaded=True)
+    assert limiter.limit == 8
+
+    clock.now = 11
+    limiter.record(0.5, overloaded=True)
+    assert limiter.limit == 4
+
+def test_latency_inflation_backs_off(clock):
+    """Test smoothed latency far above baseline counts as overload"""
+    limiter = AIMDLimiter(initial=8, clock=clock)
+    for _ in range(10):
+        limiter.record(0.1, overloaded=False)
+
+    clock.now = 10
+    for _ in range(5):
+        limiter.record(1.0, overloaded=False)
+
+    assert limiter.limit < 8
+    assert limiter.overloads >= 1
+
+def test_slow_streak_restarts_after_backing_off(clock):
+    """Test one stall that slowed every request in flight counts once"""
+    limiter = AIMDLimiter(initial=16, clock=clock)
+    limiter.record(0.1, overloaded=False)
+
+    for i in range(5):
+        clock.now = 10 + i
+        limiter.record(1.0, overloaded=False)
+
+    assert limiter.limit == 8
+    assert limiter.overloads == 1
+
+def test_probe_only_checks_leave_latency_baseline_alone(clock):
+    """Test cheap probe-only checks don't make full downloads look slow"""
+    limiter = AIMDLimiter(initial=8, clock=clock)
+    for i in range(10):
+        clock.now = i
+        limiter.record(None, overloaded=False)  # probe said nothing changed
+        limiter.record(0.5, overloaded=False)   # full download
+
+    assert limiter.baseline == 0.5
+    assert limiter.overloads == 0
+    assert limiter.completed == 20
+
+def test_limit_respects_bounds(clock):
+    """Test the limit never leaves [minimum, maximum]"""
+    limiter = AIMDLimiter(initial=2, minimum=1, maximum=3, clock=clock)
+    for i in range(10):
+        clock.now = i * 10
+        limiter.record(0.1, overloaded=True)
+    assert limiter.limit == 1
+
+    for _ in range(50):
+        saturate(limiter)
+        limiter.record(0.1, overloaded=False)
+    assert limiter.limit == 3
+
+@pytest.mark.asyncio
+async def test_slot_enforces_host_limit_and_records_timeouts():
+    """Test in-flight checks per host are capped and timeouts back off"""
+    controller = ConcurrencyController(host_initial=2, host_maximum=2)
+    peak = 0
+
+    async def check():
+        nonlocal peak
+        async with controller.slot("test.com"):
+            peak = max(peak, controller.host("test.com").in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(check() for _ in range(6)))
+    assert peak == 2
+
+    with pytest.raises(asyncio.TimeoutError):
+        async with controller.slot("test.com"):
+            raise asyncio.TimeoutError()
+
+    snapshot = controller.snapshot()
+    assert snapshot["hosts"]["test.com"]["limit"] == 1
+    assert snapshot["hosts"]["test.com"]["in_flight"] == 0
+    assert snapshot["global"]["overloads"] == 1
+
+class CapacityScraper(BaseScraper):
+    """Fake source on a host that answers 503 above a given concurrency"""
+
+    host_state = {"in_flight": 0, "capacity": 4}
+
+    async def fetch_latest(self):
+        state = self.host_state
+        state["in_flight"] += 1
+        try:
+            await asyncio.sleep(0.005)
+            self.last_status = 503 if state["in_flight"] > state["capacity"] else 200
+            return None
+        finally:
+            state["in_flight"] -= 1
+
+    def get_item_id(self, item):
+        return item.id
+
+    def format_notification(self, item):
+        return item.title
+
+    def validate_item(self, item):
+        return True
+
+@pytest.mark.asyncio
+async def test_bot_manager_converges_below_host_capacity(tmp_path):
+    """Test the per-host limit settles around what the host can take"""
+    scrapers = [CapacityScraper(f"https://test.com/{i}", f"fake_{i}") for i in range(40)]
+    controller = ConcurrencyController(host_initial=1, host_maximum=16, global_maximum=64)
+    bot = BotManager(scrapers, StorageHandler(str(tmp_path)), AsyncMock(), controller=controller)
+
+    for _ in range(15):
+        await bot.check_all_scrapers()
+
+    limit = controller.snapshot()["hosts"]["test.com"]["limit"]
+    assert 2 <= limit <= 6
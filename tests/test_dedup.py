@@ -0,0 +1,110 @@
+import pytest
+from unittest.mock import AsyncMock
+
+from src.bot.manager import BotManager
+from src.scrapers.manga import MangaScraper
+from src.storage.dedup import DedupIndex, normalize_url, normalize_title
+from src.storage.handler import StorageHandler
+
+def test_normalize_url():
+    """Test equivalent links normalise to the same form"""
+    expected = normalize_url("https://test.com/post/1?b=2&a=1")
+
+    assert normalize_url("http://WWW.Test.com:80/post/1/?a=1&b=2#comments") == expected
+    assert normalize_url("https://test.com/post/1?a=1&utm_source=rss&b=2&fbclid=x") == expected
+    assert normalize_url("https://test.com:8443/post/1?a=1&b=2") != expected
+
+def test_normalize_title():
+    """Test titles ignore case, punctuation and spacing"""
+    assert normalize_title("One Piece — Chapter 1100!") == normalize_title("one piece chapter  1100")
+
+def test_check_and_add_matches_urls(make_item):
+    """Test items sharing a normalised URL are reported as duplicates"""
+    index = DedupIndex()
+
+    assert index.check_and_add(make_item(url="https://test.com/post/1", title="Post 1")) is False
+    assert index.check_and_add(make_item(url="https://www.test.com/post/1/", title="Other")) is True
+    assert index.check_and_add(make_item(url="https://test.com/post/2", title="Post 1")) is False
+
+def test_shared_title_on_other_host_is_not_a_duplicate(make_item):
+    """Test unrelated posts with a common title are both notified"""
+    index = DedupIndex(match_titles=True)
+
+    assert index.check_and_add(make_item(url="https://a.com/p/1", title="Weekly Links")) is False
+    assert index.check_and_add(make_item(url="https://b.org/2024/x", title="Weekly links")) is False
+
+def test_title_matching_within_a_host(make_item):
+    """Test opt-in title matching catches one post linked under two URLs"""
+    index = DedupIndex(match_titles=True)
+    index.add(make_item(url="https://test.com/post/1", title="Post 1"))
+
+    assert index.seen(make_item(url="https://www.test.com/2024/01/post-1", title="post 1"))
+    assert not DedupIndex().seen(make_item(url="https://test.com/2024/01/post-1", title="Post 1"))
+
+def test_content_parameters_are_kept():
+    """Test parameters some sites use for content aren't stripped as tracking"""
+    assert normalize_url("https://test.com/?source=rss") != normalize_url("https://test.com/")
+    assert normalize_url("https://test.com/?ref=main") != normalize_url("https://test.com/")
+
+def test_entries_expire_after_window(make_item, clock):
+    """Test fingerprints are evicted once the window has passed"""
+    index = DedupIndex(window=60, clock=clock)
+    index.add(make_item(url="https://test.com/post/1"))
+
+    clock.now = 59
+    assert index.seen(make_item(url="https://test.com/post/1"))
+    clock.now = 121
+    assert not index.seen(make_item(url="https://test.com/post/1"))
+    assert len(index) == 0
+
+def test_index_size_is_bounded(make_item):
+    """Test the oldest fingerprints are evicted beyond max_entries"""
+    index = DedupIndex(max_entries=10)
+    for i in range(100):
+        index.add(make_item(url=f"https://test.com/post/{i}"))
+
+    assert len(index) == 10
+    assert index.seen(make_item(url="https://test.com/post/99"))
+    assert not index.seen(make_item(url="https://test.com/post/0"))
+
+@pytest.mark.asyncio
+async def test_bot_manager_skips_duplicate_notifications(tmp_path, make_item):
+    """Test only the first source to report an item notifies"""
+    notifier = AsyncMock()
+    bot = BotManager([], StorageHandler(str(tmp_path)), notifier, dedup=DedupIndex())
+    scraper = AsyncMock()
+    scraper.dedup_group = None
+    scraper.format_notification = lambda item: item.url
+
+    await bot.notify(scraper, make_item(url="https://test.com/post/1"))
+    await bot.notify(scraper, make_item(url="https://www.test.com/post/1?utm_medium=feed"))
+
+    notifier.send_telegram.assert_awaited_once_with("https://test.com/post/1")
+
+def test_dedup_group_matches_across_hosts(make_item):
+    """Test items with the same id in one group match whatever their URL"""
+    index = DedupIndex()
+    first = make_item("1100", url="https://a.com/one-piece-1100")
+    mirror = make_item("1100", url="https://b.org/op/1100")
+
+    assert index.check_and_add(first, group="one-piece") is False
+    assert not index.seen(mirror)
+    assert not index.seen(mirror, group="bleach")
+    assert index.check_and_add(mirror, group="one-piece") is True
+
+@pytest.mark.asyncio
+async def test_mirrors_in_one_group_notify_once(tmp_path):
+    """Test the same chapter from two mirror hosts is notified once"""
+    notifier = AsyncMock()
+    bot = BotManager([], StorageHandler(str(tmp_path)), notifier, dedup=DedupIndex())
+    mirrors = [
+        MangaScraper("one-piece", "https://mirror-a.com", dedup_group="one-piece"),
+        MangaScraper("one-piece", "https://mirror-b.org", dedup_group="one-piece"),
+    ]
+
+    for scraper in mirrors:
+        item = scraper.build_item("<ul><li data-num='1100'>1100</li></ul>")
+        await bot.notify(scraper, item)
+
+    notifier.send_telegram.assert_awaited_once()
+    assert "mirror-a.com" in notifier.send_telegram.await_args.args[0]
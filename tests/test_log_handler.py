@@ -0,0 +1,77 @@
+import pytest
+import json
+import logging
+from src.logs.handler import JsonFormatter, RepeatFilter, setup_logging, log_stage
+
+def make_record(msg, *args, level=logging.ERROR, **extra):
+    record = logging.LogRecord("test", level, __file__, 1, msg, args, None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+def test_json_formatter_structured_fields():
+    """Test records are rendered as JSON with structured fields"""
+    record = make_record("Fetched %s", "feed", source="blog_test", stage="fetch", duration=0.25)
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert payload["message"] == "Fetched feed"
+    assert payload["level"] == "ERROR"
+    assert payload["source"] == "blog_test"
+    assert payload["stage"] == "fetch"
+    assert payload["duration"] == 0.25
+
+def test_repeat_filter_suppresses_identical_errors():
+    """Test identical errors are dropped within the interval and counted"""
+    repeat_filter = RepeatFilter(interval=60)
+
+    assert repeat_filter.filter(make_record("boom %s", 1)) is True
+    assert repeat_filter.filter(make_record("boom %s", 1)) is False
+    assert repeat_filter.filter(make_record("boom %s", 2)) is True
+    assert repeat_filter.filter(make_record("boom %s", 1, level=logging.INFO)) is True
+
+def test_repeat_filter_reports_suppressed_count():
+    """Test the next emitted copy carries the number of dropped repeats"""
+    repeat_filter = RepeatFilter(interval=60)
+    repeat_filter.filter(make_record("boom"))
+    repeat_filter.filter(make_record("boom"))
+    repeat_filter.filter(make_record("boom"))
+
+    # Pretend the interval elapsed
+    key = next(iter(repeat_filter._seen))
+    repeat_filter._seen[key] = (0.0, repeat_filter._seen[key][1])
+
+    record = make_record("boom")
+    assert repeat_filter.filter(record) is True
+    assert record.suppressed == 2
+
+def test_setup_logging_writes_from_background_thread(tmp_path, restore_root_logger):
+    """Test records reach the log file through the queue listener"""
+    log_file = tmp_path / "bot.log"
+    listener = setup_logging(str(log_file), "DEBUG")
+    try:
+        with log_stage("manga_test", "fetch"):
+            pass
+        try:
+            raise ValueError("bad page")
+        except ValueError:
+            logging.exception("Parse failed for %s", "manga_test")
+    finally:
+        listener.stop()
+
+    lines = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert lines[0]["source"] == "manga_test"
+    assert lines[0]["stage"] == "fetch"
+    assert "duration" in lines[0]
+    assert lines[1]["message"] == "Parse failed for manga_test"
+    assert "ValueError: bad page" in lines[1]["exception"]
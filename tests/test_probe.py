@@ -0,0 +1,239 @@
+import pytest
+import gzip
+import random
+import re
+import string
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.scrapers.manga import MangaScraper
+from src.scrapers.probe import (
+    ChangeProbe, ProbeUnavailable, TieredProber, HeadProbe, RangeProbe, EndpointProbe
+)
+
+class FakeProbe(ChangeProbe):
+    def __init__(self, name, answers):
+        self.name = name
+        self.answers = list(answers)
+
+    async def signature(self, session, url):
+        answer = self.answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+async def poll(prober, changed=None):
+    """Probe once and, if a download is requested, report its outcome"""
+    fetch = await prober.should_fetch(None, "https://test.com")
+    if fetch:
+        prober.record_fetch(changed=bool(changed))
+    return fetch
+
+@pytest.mark.asyncio
+async def test_unchanged_signature_skips_download():
+    """Test a stable signature avoids the full download"""
+    prober = TieredProber([FakeProbe("head", ["a", "a", "b"])])
+
+    assert await poll(prober) is True          # baseline
+    assert await poll(prober) is False         # unchanged
+    assert await poll(prober, changed=True) is True
+    assert prober.stats["head"].skips == 1
+
+@pytest.mark.asyncio
+async def test_unsupported_probe_falls_through_to_next_tier():
+    """Test a probe the server can't answer is dropped for the next one"""
+    prober = TieredProber([FakeProbe("head", [None]), FakeProbe("range", ["x", "x"])])
+
+    assert await poll(prober) is True
+    assert prober.stats["head"].disabled == "not supported by server"
+    assert await poll(prober) is False
+
+@pytest.mark.asyncio
+async def test_noisy_probe_is_disabled():
+    """Test a probe whose changes are mostly false alarms is dropped"""
+    prober = TieredProber([FakeProbe("head", [str(i) for i in range(10)])], min_samples=4)
+
+    for _ in range(5):
+        await poll(prober, changed=False)
+
+    assert prober.stats["head"].false_positives >= 3
+    assert prober.stats["head"].disabled == "too many false alarms"
+
+@pytest.mark.asyncio
+async def test_forced_download_catches_missed_change():
+    """Test a probe that misses a change is dropped after the forced download"""
+    prober = TieredProber([FakeProbe("head", ["a"] * 4)], max_skips=2)
+
+    assert await poll(prober) is True
+    assert await poll(prober) is False
+    assert await poll(prober) is False
+    assert await poll(prober, changed=True) is True
+    assert prober.stats["head"].misses == 1
+    assert prober.stats["head"].disabled == "missed a change"
+
+@pytest.mark.asyncio
+async def test_transient_failure_requests_download_without_penalty():
+    """Test an unavailable probe triggers a download but stays enabled"""
+    prober = TieredProber([FakeProbe("head", ["a", ProbeUnavailable("503")])])
+
+    await poll(prober)
+    assert await poll(prober) is True
+    assert prober.stats["head"].disabled is None
+
+@pytest.mark.asyncio
+async def test_persistently_failing_probe_is_disabled_and_falls_through():
+    """Test a probe that never answers hands over to the next tier, then is dropped"""
+    failing = FakeProbe("head", [ProbeUnavailable("503")] * 3)
+    prober = TieredProber([failing, FakeProbe("range", ["x"] * 3)], max_failures=3)
+
+    assert await poll(prober) is True    # range baseline
+    assert await poll(prober) is False   # range decides while head fails
+    assert await poll(prober) is False
+    assert prober.stats["head"].disabled == "failed 3 times in a row"
+    assert prober.stats["range"].skips == 2
+    assert not failing.answers
+
+def range_response(request, body):
+    match = re.match(r"bytes=(\d+)-(\d+)", request.headers.get("Range", ""))
+    if not match:
+        return web.Response(body=body)
+    start, end = int(match.group(1)), int(match.group(2))
+    return web.Response(status=206, body=body[start:end + 1])
+
+@pytest.mark.asyncio
+async def test_manga_scraper_uses_ranged_probe_against_local_server():
+    """Test the scraper learns the list region and skips unchanged pages"""
+    page = {"body": ("<html>" + "x" * 20000 + "\n<ul><li data-num='10'></li></ul></html>").encode()}
+    counts = {"GET": 0, "RANGE": 0, "HEAD": 0}
+
+    async def handle(request):
+        if request.method == "HEAD":
+            counts["HEAD"] += 1
+            return web.Response(status=405)
+        if "Range" in request.headers:
+            counts["RANGE"] += 1
+        else:
+            counts["GET"] += 1
+        return range_response(request, page["body"])
+
+    app = web.Application()
+    app.router.add_route("*", "/manga/test-manga", handle)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        scraper = MangaScraper("test-manga", str(server.make_url("")).rstrip("/"))
+
+        first = await scraper.fetch_latest()
+        assert scraper.prober.probes[1].start > 19000
+        for _ in range(3):
+            assert (await scraper.fetch_latest()).id == first.id
+
+        page["body"] = page["body"].replace(b"<ul>", b"<ul><li data-num='11'></li>")
+        assert (await scraper.fetch_latest()).id == "11"
+    finally:
+        await server.close()
+
+    assert scraper.prober.stats["head"].disabled == "not supported by server"
+    # First download, baseline once HEAD was dropped, then the real change
+    assert counts["GET"] == 3
+    assert counts["RANGE"] == 4
+
+@pytest.mark.asyncio
+async def test_range_probe_on_compressing_server():
+    """Test ranges are taken from the uncompressed page a gzip-happy server sends"""
+    # Random text so the gzip stream reaches well past the list
+    rng = random.Random(0)
+    before, after = (
+        "".join(rng.choice(string.ascii_letters + "é") for _ in range(n)) for n in (2000, 20000)
+    )
+    body = f"<html>{before}\n<ul><li data-num='10'></li></ul>{after}</html>".encode()
+    counts = {"GET": 0, "RANGE": 0}
+
+    async def handle(request):
+        if request.method == "HEAD":
+            return web.Response(status=405)
+        # Like servers that compress first and apply the range to the result
+        gzipped = "gzip" in request.headers.get("Accept-Encoding", "")
+        payload = gzip.compress(body) if gzipped else body
+        headers = {"Content-Encoding": "gzip"} if gzipped else {}
+        match = re.match(r"bytes=(\d+)-(\d+)", request.headers.get("Range", ""))
+        if not match:
+            counts["GET"] += 1
+            return web.Response(body=payload, headers=headers,
+                                content_type="text/html", charset="utf-8")
+        counts["RANGE"] += 1
+        start, end = int(match.group(1)), int(match.group(2))
+        return web.Response(status=206, body=payload[start:end + 1], headers=headers)
+
+    app = web.Application()
+    app.router.add_route("*", "/manga/test-manga", handle)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        scraper = MangaScraper("test-manga", str(server.make_url("")).rstrip("/"))
+        for _ in range(5):
+            assert (await scraper.fetch_latest()).id == "10"
+    finally:
+        await server.close()
+
+    # Offsets count the multi-byte characters as bytes
+    assert scraper.prober.probes[1].start == body.index(b"<li") - 512
+    assert scraper.prober.stats["range"].disabled is None
+    assert scraper.prober.stats["range"].skips == 3
+    assert counts["GET"] == 2
+
+@pytest.mark.asyncio
+async def test_forbidden_head_is_dropped_for_range_probe():
+    """Test a HEAD refused with 403 is disabled at once instead of costing every poll"""
+    body = ("<html>" + "x" * 20000 + "\n<ul><li data-num='10'></li></ul></html>").encode()
+    counts = {"GET": 0, "RANGE": 0, "HEAD": 0}
+
+    async def handle(request):
+        if request.method == "HEAD":
+            counts["HEAD"] += 1
+            return web.Response(status=403)
+        counts["RANGE" if "Range" in request.headers else "GET"] += 1
+        return range_response(request, body)
+
+    app = web.Application()
+    app.router.add_route("*", "/manga/test-manga", handle)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        scraper = MangaScraper("test-manga", str(server.make_url("")).rstrip("/"))
+        for _ in range(10):
+            await scraper.fetch_latest()
+    finally:
+        await server.close()
+
+    assert counts["HEAD"] == 1
+    assert scraper.prober.stats["head"].disabled == "not supported by server"
+    assert scraper.prober.stats["range"].skips > 0
+    assert counts["GET"] <= 3
+
+@pytest.mark.asyncio
+async def test_head_and_endpoint_signatures():
+    """Test HEAD headers and endpoint bodies produce signatures"""
+    async def page(request):
+        return web.Response(text="page", headers={"ETag": '"v1"'})
+
+    async def api(request):
+        return web.json_response({"chapters": 10})
+
+    app = web.Application()
+    app.router.add_get("/page", page)
+    app.router.add_get("/api", api)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        async with aiohttp.ClientSession() as session:
+            head = await HeadProbe().signature(session, str(server.make_url("/page")))
+            endpoint = await EndpointProbe(str(server.make_url("/api"))).signature(session, "")
+            with pytest.raises(ProbeUnavailable):
+                await RangeProbe().signature(session, str(server.make_url("/page")))
+    finally:
+        await server.close()
+
+    assert head == 'ETag:"v1"'
+    assert endpoint
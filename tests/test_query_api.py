@@ -0,0 +1,138 @@
+import pytest
+from unittest.mock import AsyncMock
+from aiohttp.test_utils import TestClient, TestServer
+
+from src.api.server import QueryServer
+from src.bot.manager import BotManager
+from src.scrapers.blog import BlogScraper
+from src.storage.handler import StorageHandler
+from src.storage.index import StateIndex
+
+@pytest.fixture
+def scraper():
+    scraper = BlogScraper("https://test.com/feed", "Test Blog")
+    scraper.fetch_latest = AsyncMock()
+    return scraper
+
+@pytest.fixture
+def bot(tmp_path, scraper):
+    return BotManager([scraper], StorageHandler(str(tmp_path)), AsyncMock(),
+                      state_index=StateIndex(history_size=2))
+
+async def make_client(bot):
+    client = TestClient(TestServer(QueryServer(bot.state_index).build_app()))
+    await client.start_server()
+    return client
+
+def test_state_index_load_seeds_from_storage(tmp_path):
+    """Test the index starts from what is already stored"""
+    storage = StorageHandler(str(tmp_path))
+    storage.store_latest("blog_a", {"id": "1", "title": "Post 1"})
+    index = StateIndex()
+    index.load(storage, ["blog_a", "blog_b"])
+
+    assert index.get("blog_a").latest["id"] == "1"
+    assert index.get("blog_b").latest is None
+    assert index.keys() == ["blog_a", "blog_b"]
+
+@pytest.mark.asyncio
+async def test_index_tracks_latest_and_bounded_history(bot, scraper, make_item):
+    """Test checks update the index in place"""
+    for item_id in ("1", "2", "3"):
+        scraper.fetch_latest.return_value = make_item(item_id)
+        await bot.check_scraper(scraper)
+
+    state = bot.state_index.get(scraper.storage_key)
+    assert state.latest["id"] == "3"
+    assert [entry["id"] for entry in state.history] == ["3", "2"]
+    assert state.checks == 3
+
+@pytest.mark.asyncio
+async def test_latest_endpoint_supports_etag(bot, scraper, make_item):
+    """Test conditional requests get 304 until a new item is stored"""
+    scraper.fetch_latest.return_value = make_item("1")
+    await bot.check_scraper(scraper)
+
+    client = await make_client(bot)
+    try:
+        url = f"/sources/{scraper.storage_key}/latest"
+        response = await client.get(url)
+        assert response.status == 200
+        assert (await response.json())["id"] == "1"
+        etag = response.headers["ETag"]
+
+        response = await client.get(url, headers={"If-None-Match": etag})
+        assert response.status == 304
+
+        # A check without a new item changes health, not the latest item
+        await bot.check_scraper(scraper)
+        response = await client.get(url, headers={"If-None-Match": etag})
+        assert response.status == 304
+
+        scraper.fetch_latest.return_value = make_item("2")
+        await bot.check_scraper(scraper)
+        response = await client.get(url, headers={"If-None-Match": etag})
+        assert response.status == 200
+        assert (await response.json())["id"] == "2"
+    finally:
+        await client.close()
+
+@pytest.mark.asyncio
+async def test_etag_does_not_survive_restart(tmp_path, scraper, make_item):
+    """Test versions that restart with the process can't produce a stale 304"""
+    async def latest_after_restart(item_ids, etag=None):
+        bot = BotManager([scraper], StorageHandler(str(tmp_path)), AsyncMock(),
+                         state_index=StateIndex())
+        bot.state_index.load(bot.storage, [scraper.storage_key])
+        for item_id in item_ids:
+            scraper.fetch_latest.return_value = make_item(item_id)
+            await bot.check_scraper(scraper)
+        client = await make_client(bot)
+        try:
+            headers = {"If-None-Match": etag} if etag else {}
+            response = await client.get(f"/sources/{scraper.storage_key}/latest", headers=headers)
+            return response.status, response.headers["ETag"]
+        finally:
+            await client.close()
+
+    _, etag = await latest_after_restart(["1", "2"])
+    status, _ = await latest_after_restart(["3"], etag)
+    assert status == 200
+
+@pytest.mark.asyncio
+async def test_health_reports_failing_sources(bot, scraper):
+    """Test failed checks show up in the health endpoints"""
+    scraper.fetch_latest.side_effect = Exception("Network error")
+    await bot.check_scraper(scraper)
+
+    client = await make_client(bot)
+    try:
+        health = await (await client.get("/health")).json()
+        source = await (await client.get(f"/sources/{scraper.storage_key}/health")).json()
+        missing = await client.get("/sources/unknown")
+    finally:
+        await client.close()
+
+    assert health["status"] == "degraded"
+    assert health["failing"] == [scraper.storage_key]
+    assert source["consecutive_failures"] == 1
+    assert source["last_error"] == "Network error"
+    assert missing.status == 404
+
+@pytest.mark.asyncio
+async def test_concurrency_endpoint_exposes_controller(bot, scraper, make_item):
+    """Test the adaptive limits can be inspected over the API"""
+    scraper.fetch_latest.return_value = make_item("1")
+    await bot.check_scraper(scraper)
+
+    client = TestClient(TestServer(
+        QueryServer(bot.state_index, controller=bot.controller).build_app()
+    ))
+    await client.start_server()
+    try:
+        snapshot = await (await client.get("/concurrency")).json()
+    finally:
+        await client.close()
+
+    assert snapshot["global"]["completed"] == 1
+    assert snapshot["hosts"]["test.com"]["in_flight"] == 0
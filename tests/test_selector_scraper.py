@@ -0,0 +1,64 @@
+import pytest
+from src.scrapers.selector import SelectorConfig, SelectorScraper, compile_plan, TEXT
+from src.scrapers.manga import MangaScraper, MANGA_SELECTORS
+
+CHAPTER_LIST = """
+    <html>
+        <ul>
+            <li data-num="123 RAW"><a href="/c/123">Chapter 123 RAW</a></li>
+            <li data-num="122"><a href="/c/122">Chapter 122</a></li>
+            <li data-num="121.5"><a href="/c/121.5">Chapter 121.5</a></li>
+        </ul>
+    </html>
+"""
+
+def test_compile_plan_is_cached():
+    """Test equal configs share one compiled plan"""
+    config = SelectorConfig(item_selector="li[data-num]", number_attribute="data-num")
+    same = SelectorConfig(item_selector="li[data-num]", number_attribute="data-num")
+
+    assert compile_plan(config) is compile_plan(same)
+    assert compile_plan(MANGA_SELECTORS) is not compile_plan(config)
+
+def test_plan_skips_matching_items():
+    """Test skip rules fall back to the highest remaining item"""
+    extraction = compile_plan(MANGA_SELECTORS).extract(CHAPTER_LIST)
+
+    assert extraction is not None
+    assert extraction.number == 122
+    assert extraction.raw == "122"
+
+def test_plan_no_matches():
+    """Test extraction on a page without candidate items"""
+    assert compile_plan(MANGA_SELECTORS).extract("<html></html>") is None
+
+def test_selector_scraper_builds_item_from_fields():
+    """Test attribute extractors and templates build the item"""
+    config = SelectorConfig(
+        item_selector="ul > li a",
+        number_attribute=TEXT,
+        skip_patterns=("RAW",),
+        fields=(("path", "href"),),
+        title_template="{name} episode {number}",
+        url_template="https://test.com{path}"
+    )
+    scraper = SelectorScraper("Test Show", "https://test.com/show", config)
+
+    item = scraper.build_item(CHAPTER_LIST)
+
+    assert item is not None
+    assert item.id == "122"
+    assert item.title == "Test Show episode 122"
+    assert item.url == "https://test.com/c/122"
+    assert item.content == {"number": 122, "path": "/c/122"}
+    assert scraper.validate_item(item)
+
+def test_manga_scraper_uses_manga_templates():
+    """Test the manga configuration reproduces the chapter item layout"""
+    scraper = MangaScraper("test-manga", "https://test.com")
+    item = scraper.build_item(CHAPTER_LIST)
+
+    assert item.title == "Test-Manga Chapter 122"
+    assert item.url == "https://test.com/test-manga-122"
+    assert item.content == {"chapter_number": 122}
+    assert scraper.validate_item(item)
@@ -0,0 +1,287 @@
+import pytest
+import asyncio
+import hashlib
+import hmac
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer, unused_port
+from unittest.mock import patch, AsyncMock
+
+from src.bot.manager import BotManager
+from src.scrapers.blog import BlogScraper
+from src.storage.handler import StorageHandler
+from src.websub.subscriber import Subscription, WebSubSubscriber
+
+TOPIC = "https://test.com/feed"
+
+FEED = """<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+    <title>Test Blog</title>
+    <link rel="hub" href="{hub}"/>
+    <link rel="self" href="{topic}"/>
+    <entry>
+        <id>{id}</id>
+        <title>Post {id}</title>
+        <link href="https://test.com/post/{id}"/>
+        <updated>2025-11-06T12:00:00Z</updated>
+    </entry>
+</feed>
+"""
+
+class StandInHub:
+    """Minimal local WebSub hub: verifies intent, then pushes content"""
+
+    def __init__(self, signature_secret=None):
+        self.signature_secret = signature_secret
+        self.requests = []
+        self.challenge_ok = asyncio.Event()
+        self.tasks = set()
+        self.app = web.Application()
+        self.app.router.add_post("/hub", self.handle_subscribe)
+
+    async def handle_subscribe(self, request):
+        form = await request.post()
+        self.requests.append(dict(form))
+        task = asyncio.create_task(self.verify_and_publish(dict(form)))
+        self.tasks.add(task)
+        return web.Response(status=202)
+
+    async def verify_and_publish(self, form):
+        callback = form["hub.callback"]
+        async with aiohttp.ClientSession() as session:
+            params = {
+                "hub.mode": "subscribe",
+                "hub.topic": form["hub.topic"],
+                "hub.challenge": "challenge-123",
+                "hub.lease_seconds": "600",
+            }
+            async with session.get(callback, params=params) as response:
+                if await response.text() != "challenge-123":
+                    return
+            self.challenge_ok.set()
+
+            body = FEED.format(hub="http://hub", topic=form["hub.topic"], id="42").encode()
+            secret = self.signature_secret or form["hub.secret"]
+            signature = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+            await session.post(
+                callback, data=body,
+                headers={"X-Hub-Signature": f"sha256={signature}",
+                         "Content-Type": "application/atom+xml"}
+            )
+
+async def run_push_flow(tmp_path, hub):
+    """Subscribe to a local hub, treated like an https one"""
+    hub_server = TestServer(hub.app)
+    await hub_server.start_server()
+
+    port = unused_port()
+    websub = WebSubSubscriber(
+        callback_url=f"http://127.0.0.1:{port}/websub", host="127.0.0.1", port=port
+    )
+    notifier = AsyncMock()
+    scraper = BlogScraper(TOPIC, "Test Blog")
+    scraper.hub_url, scraper.topic_url = str(hub_server.make_url("/hub")), TOPIC
+    bot = BotManager([scraper], StorageHandler(str(tmp_path)), notifier, websub=websub)
+
+    await websub.start()
+    try:
+        with patch("src.websub.subscriber.secure_hub", return_value=True):
+            await websub.maintain([scraper])
+        await asyncio.wait_for(hub.challenge_ok.wait(), 5)
+        await asyncio.wait_for(asyncio.gather(*hub.tasks), 5)
+    finally:
+        await websub.stop()
+        await hub_server.close()
+    return bot, scraper, notifier
+
+@pytest.mark.asyncio
+async def test_push_delivery_reaches_notifier(tmp_path):
+    """Test a hub push is verified and flows into check/notify"""
+    bot, scraper, notifier = await run_push_flow(tmp_path, StandInHub())
+
+    assert bot.websub.is_subscribed(scraper)
+    notifier.send_telegram.assert_awaited_once()
+    assert "Post 42" in notifier.send_telegram.await_args.args[0]
+    assert bot.storage.get_latest(scraper.storage_key)["id"] == "42"
+
+@pytest.mark.asyncio
+async def test_push_with_bad_signature_is_ignored(tmp_path):
+    """Test deliveries signed with the wrong secret are dropped"""
+    bot, scraper, notifier = await run_push_flow(tmp_path, StandInHub(signature_secret="wrong"))
+
+    assert bot.websub.is_subscribed(scraper)
+    notifier.send_telegram.assert_not_awaited()
+    assert bot.storage.get_latest(scraper.storage_key) is None
+
+@pytest.mark.asyncio
+async def test_plain_http_hub_is_not_subscribed():
+    """Test sources behind an http hub are left to polling"""
+    hub = StandInHub()
+    hub_server = TestServer(hub.app)
+    await hub_server.start_server()
+    try:
+        websub = WebSubSubscriber(callback_url="http://127.0.0.1/websub")
+        scraper = BlogScraper(TOPIC, "Test Blog")
+        scraper.hub_url, scraper.topic_url = str(hub_server.make_url("/hub")), TOPIC
+        await websub.maintain([scraper])
+    finally:
+        await hub_server.close()
+
+    assert hub.requests == []
+    assert not websub.is_subscribed(scraper)
+
+@pytest.mark.asyncio
+async def test_hanging_hub_does_not_hold_up_maintain():
+    """Test hub requests give up after hub_timeout"""
+    async def hang(request):
+        await asyncio.sleep(30)
+
+    app = web.Application()
+    app.router.add_post("/hub", hang)
+    hub_server = TestServer(app)
+    await hub_server.start_server()
+    try:
+        websub = WebSubSubscriber(callback_url="http://127.0.0.1/websub", hub_timeout=0.2)
+        scrapers = [BlogScraper(f"{TOPIC}/{i}", f"Blog {i}") for i in range(3)]
+        for scraper in scrapers:
+            scraper.hub_url, scraper.topic_url = str(hub_server.make_url("/hub")), scraper.url
+        with patch("src.websub.subscriber.secure_hub", return_value=True):
+            await asyncio.wait_for(websub.maintain(scrapers), 2)
+    finally:
+        await hub_server.close()
+
+    assert not any(websub.is_subscribed(scraper) for scraper in scrapers)
+
+def make_subscribed(on_item):
+    websub = WebSubSubscriber(callback_url="http://127.0.0.1/websub", on_item=on_item)
+    scraper = BlogScraper(TOPIC, "Test Blog")
+    sub = Subscription(scraper=scraper, hub_url="https://hub", topic_url=TOPIC, token="t",
+                       secret="secret", requested_at=0, verified=True)
+    websub.subscriptions[scraper.storage_key] = sub
+    websub._by_token[sub.token] = sub
+    return websub
+
+@pytest.mark.asyncio
+async def test_unsigned_delivery_is_ignored():
+    """Test a push without a signature never reaches on_item"""
+    on_item = AsyncMock()
+    websub = make_subscribed(on_item)
+
+    client = TestClient(TestServer(websub.build_app()))
+    await client.start_server()
+    try:
+        body = FEED.format(hub="https://hub", topic=TOPIC, id="7")
+        response = await client.post("/websub/t", data=body)
+        await websub.stop()
+    finally:
+        await client.close()
+
+    assert response.status == 202
+    on_item.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_delivery_is_acknowledged_before_item_is_handled():
+    """Test a slow notification doesn't hold up the reply to the hub"""
+    release = asyncio.Event()
+    handled = []
+
+    async def on_item(scraper, item):
+        await release.wait()
+        handled.append(item.id)
+
+    websub = make_subscribed(on_item)
+
+    client = TestClient(TestServer(websub.build_app()))
+    await client.start_server()
+    try:
+        body = FEED.format(hub="https://hub", topic=TOPIC, id="7").encode()
+        signature = hmac.new(b"secret", body, hashlib.sha256).hexdigest()
+        response = await asyncio.wait_for(client.post(
+            "/websub/t", data=body, headers={"X-Hub-Signature": f"sha256={signature}"}
+        ), 2)
+        assert response.status == 202
+        assert handled == []
+
+        release.set()
+        await websub.stop()
+    finally:
+        await client.close()
+
+    assert handled == ["7"]
+
+@pytest.mark.asyncio
+async def test_blog_scraper_discovers_hub():
+    """Test hub and self links are picked up from the feed and its headers"""
+    async def feed(request):
+        return web.Response(
+            text=FEED.format(hub="https://hub.test.com/", topic=TOPIC, id="1"),
+            content_type="application/atom+xml",
+            headers={"Link": '<https://header-hub.test.com/>; rel="hub"'}
+        )
+
+    app = web.Application()
+    app.router.add_get("/feed", feed)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        scraper = BlogScraper(str(server.make_url("/feed")), "Test Blog")
+        result = await scraper.fetch_latest()
+    finally:
+        await server.close()
+
+    assert result.id == "1"
+    assert scraper.last_status == 200
+    assert scraper.hub_url == "https://header-hub.test.com/"
+    assert scraper.topic_url == TOPIC
+
+@pytest.mark.asyncio
+async def test_blog_fetch_is_cancelled_by_timeout():
+    """Test a hanging feed host doesn't outlive the check's timeout"""
+    hung = asyncio.Event()
+    closed = asyncio.Event()
+
+    async def feed(request):
+        hung.set()
+        try:
+            await asyncio.sleep(30)
+        finally:
+            closed.set()
+
+    app = web.Application()
+    app.router.add_get("/feed", feed)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        scraper = BlogScraper(str(server.make_url("/feed")), "Test Blog")
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(scraper.fetch_latest(), 0.2)
+        await asyncio.wait_for(closed.wait(), 5)
+    finally:
+        await server.close()
+
+    assert hung.is_set()
+
+@pytest.mark.asyncio
+async def test_subscribed_scrapers_poll_on_safety_interval(tmp_path):
+    """Test subscribed sources are skipped until the safety-net interval"""
+    websub = WebSubSubscriber(callback_url="http://127.0.0.1/websub")
+    scraper = BlogScraper(TOPIC, "Test Blog")
+    scraper.fetch_latest = AsyncMock(return_value=None)
+    bot = BotManager([scraper], StorageHandler(str(tmp_path)), AsyncMock(),
+                     websub=websub, push_poll_interval=3600)
+
+    with patch.object(websub, "is_subscribed", return_value=True):
+        await bot.check_all_scrapers()
+        await bot.check_all_scrapers()
+
+    assert scraper.fetch_latest.await_count == 1
+
+def test_verify_signature():
+    """Test X-Hub-Signature validation"""
+    body = b"<feed/>"
+    signature = hmac.new(b"secret", body, hashlib.sha1).hexdigest()
+
+    assert WebSubSubscriber.verify_signature("secret", body, f"sha1={signature}")
+    assert not WebSubSubscriber.verify_signature("other", body, f"sha1={signature}")
+    assert not WebSubSubscriber.verify_signature("secret", body, f"md5={signature}")
+    assert not WebSubSubscriber.verify_signature("secret", body, "")